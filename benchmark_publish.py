@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from loguru import logger
+
+from src.config import settings
+from src.core.database import DatabaseManager
+from src.publisher.benchmark import (
+    BenchmarkConfig,
+    cleanup,
+    foreign_pending_posts,
+    run_benchmark,
+)
+from src.utils.fake_bot_api import FakeBotAPI, FakeBotAPIConfig
+from src.utils.logger import setup_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Publish throughput benchmark against a local fake Bot API. "
+        "Run it on a dedicated database: the dispatcher publishes every pending post."
+    )
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--targets", type=int, default=0, help="Cross-post channels per post")
+    parser.add_argument("--photos", type=int, default=0, help="Photos per post")
+    parser.add_argument("--start-in", type=float, default=5.0, help="Seconds until the first post is due")
+    parser.add_argument("--spread", type=float, default=0.0, help="Seconds between the first and the last post")
+    parser.add_argument("--workers", type=int, default=settings.publisher.workers)
+    parser.add_argument("--batch-size", type=int, default=settings.publisher.batch_size)
+    parser.add_argument("--tick", type=float, default=settings.publisher.tick)
+    parser.add_argument("--no-stage", action="store_true", help="Load posts at publish time")
+    parser.add_argument("--no-rate-limit", action="store_true", help="Disable the session rate limiter")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake API response delay, seconds")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--flood-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chat-limit", type=float, default=1.0)
+    parser.add_argument("--global-limit", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded channels and posts")
+    parser.add_argument("--force", action="store_true", help="Run even if other posts are pending")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> int:
+    config = BenchmarkConfig(
+        channels=args.channels,
+        posts=args.posts,
+        targets=args.targets,
+        photos=args.photos,
+        start_in=args.start_in,
+        spread=args.spread,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        tick=args.tick,
+        stage=not args.no_stage,
+        rate_limit=not args.no_rate_limit,
+        timeout=args.timeout,
+    )
+    server = FakeBotAPI(
+        FakeBotAPIConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            flood_rate=args.flood_rate,
+            error_rate=args.error_rate,
+            chat_limit=args.chat_limit,
+            global_limit=args.global_limit,
+            seed=0,
+        ),
+        port=args.port,
+    )
+    db_manager = DatabaseManager(
+        url=str(settings.db.url),
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+    )
+    monitor = DatabaseManager(url=str(settings.db.url), pool_size=1, max_overflow=0)
+    try:
+        foreign = await foreign_pending_posts(monitor, config)
+        if foreign and not args.force:
+            logger.error(f"{foreign} other posts are pending and would be published, use --force")
+            return 1
+        # Остатки прошлого прогона с --keep
+        await cleanup(monitor, config)
+        await server.start()
+        report = await run_benchmark(db_manager, monitor, server, config)
+    finally:
+        await server.stop()
+        if not args.keep:
+            await cleanup(monitor, config)
+        await db_manager.dispose()
+        await monitor.dispose()
+    if args.json:
+        print(json.dumps(report.as_dict()))
+    else:
+        for name, value in report.as_dict().items():
+            logger.info(f"{name}: {value}")
+    return 0 if report.published == config.posts else 1
+
+
+if __name__ == "__main__":
+    setup_logging(log_level="INFO", json_format=False)
+    sys.exit(asyncio.run(run(parse_args())))
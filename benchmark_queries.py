@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from loguru import logger
+
+from src.config import settings
+from src.core.database import DatabaseManager
+from src.core.plan_benchmark import PlanBenchmarkConfig, cleanup, run_plan_benchmark, seed
+from src.utils.logger import setup_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Hot path query plans with and without the hot path indexes. "
+        "Run it on a dedicated, migrated database: the 'before' pass drops the indexes "
+        "inside a transaction and holds exclusive locks until it rolls back."
+    )
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--logs", type=int, default=1_000_000)
+    parser.add_argument("--pending-share", type=float, default=0.05, help="Share of pending posts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per query, the fastest is reported")
+    parser.add_argument("--keep", action="store_true", help="Keep seeded data for the next run")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> int:
+    config = PlanBenchmarkConfig(
+        channels=args.channels,
+        posts=args.posts,
+        logs=args.logs,
+        pending_share=args.pending_share,
+        repeat=args.repeat,
+    )
+    db_manager = DatabaseManager(url=str(settings.db.url), pool_size=1, max_overflow=0)
+    try:
+        if not await seed(db_manager, config):
+            logger.info("Reusing data seeded by a previous run with --keep")
+        plans = await run_plan_benchmark(db_manager, config)
+    finally:
+        if not args.keep:
+            await cleanup(db_manager, config)
+        await db_manager.dispose()
+    if args.json:
+        print(json.dumps([plan.as_dict() for plan in plans]))
+    else:
+        for plan in plans:
+            logger.info(
+                f"{plan.query}: {plan.before_ms} ms / {plan.before_buffers} buffers -> "
+                f"{plan.after_ms} ms / {plan.after_buffers} buffers"
+            )
+            logger.info(f"  before: {plan.before_plan}")
+            logger.info(f"  after:  {plan.after_plan}")
+    return 0
+
+
+if __name__ == "__main__":
+    setup_logging(log_level="INFO", json_format=False)
+    sys.exit(asyncio.run(run(parse_args())))
@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+
+from loguru import logger
+
+from src.utils.fake_bot_api import FakeBotAPI, FakeBotAPIConfig
+from src.utils.logger import setup_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Local fake Telegram Bot API for load tests and fault injection"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response delay, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, seconds")
+    parser.add_argument("--flood-rate", type=float, default=0.0, help="Share of 429 responses")
+    parser.add_argument("--retry-after", type=int, default=5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests starting a 5xx burst")
+    parser.add_argument("--error-burst", type=int, default=3)
+    parser.add_argument("--chat-limit", type=float, default=1.0, help="Messages per second per chat, 0 to disable")
+    parser.add_argument("--global-limit", type=float, default=30.0, help="Messages per second in total, 0 to disable")
+    parser.add_argument("--seed", type=int)
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace):
+    server = FakeBotAPI(
+        FakeBotAPIConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            flood_rate=args.flood_rate,
+            retry_after=args.retry_after,
+            error_rate=args.error_rate,
+            error_burst=args.error_burst,
+            chat_limit=args.chat_limit,
+            global_limit=args.global_limit,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    await server.start()
+    logger.info(f"Point the bot at it with AIOGRAM_CONFIG__RUN__API_SERVER={server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        logger.info(f"Served: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    setup_logging(log_level="INFO", json_format=False)
+    try:
+        asyncio.run(run(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import sys
+
+from loguru import logger
+
+from src.config import settings
+from src.core.database import DatabaseManager
+from src.publisher.bulk_import import detect_format, import_posts, read_rows
+from src.utils.logger import setup_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk import of posts from CSV/JSONL")
+    parser.add_argument("file", help="Path to .csv or .jsonl file, '-' for stdin")
+    parser.add_argument("--created-by", type=int, required=True, help="Telegram ID of the author")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--strict", action="store_true", help="Abort on the first invalid row")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> int:
+    db_manager = DatabaseManager(
+        url=str(settings.db.url),
+        echo=settings.db.echo,
+        pool_size=1,
+        max_overflow=0,
+    )
+    fmt = args.format or detect_format(args.file)
+    stream = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_posts(
+            db_manager,
+            read_rows(stream, fmt),
+            created_by=args.created_by,
+            chunk_size=args.chunk_size,
+            strict=args.strict,
+        )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        await db_manager.dispose()
+    for line, error in report.errors:
+        logger.warning(f"Line {line}: {error}")
+    # Ведущая реплика подхватит новые посты очередным опросом таблицы
+    logger.info(f"Imported {report.imported} posts, rejected {len(report.errors)} rows")
+    return 1 if report.errors and args.strict else 0
+
+
+if __name__ == "__main__":
+    setup_logging(log_level="INFO", json_format=False)
+    sys.exit(asyncio.run(run(parse_args())))
@@ -0,0 +1,54 @@
+"""Recurring post rules
+
+Revision ID: 18e33be202d7
+Revises: fec9ff1ac452
+Create Date: 2026-10-18 16:41:05.270913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '18e33be202d7'
+down_revision: Union[str, None] = 'fec9ff1ac452'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('recurring_rules',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('channel_id', sa.BigInteger(), nullable=False),
+    sa.Column('title', sa.Text(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('photos', postgresql.ARRAY(sa.String()), nullable=True),
+    sa.Column('videos', postgresql.ARRAY(sa.String()), nullable=True),
+    sa.Column('document', sa.String(length=255), nullable=True),
+    sa.Column('cron', sa.String(length=255), nullable=True),
+    sa.Column('interval', sa.Integer(), nullable=True),
+    sa.Column('start_at', sa.DateTime(), nullable=False),
+    sa.Column('end_at', sa.DateTime(), nullable=True),
+    sa.Column('next_run', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['channel_id'], ['channels.id'], name=op.f('fk_recurring_rules_channel_id_channels')),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], name=op.f('fk_recurring_rules_created_by_users')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_recurring_rules'))
+    )
+    op.create_index(op.f('ix_recurring_rules_next_run'), 'recurring_rules', ['next_run'], unique=False)
+    op.add_column('posts', sa.Column('rule_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(op.f('fk_posts_rule_id_recurring_rules'), 'posts', 'recurring_rules', ['rule_id'], ['id'], ondelete='SET NULL')
+    op.create_unique_constraint(op.f('uq_posts_rule_id_publish_time'), 'posts', ['rule_id', 'publish_time'])
+
+
+def downgrade() -> None:
+    op.drop_constraint(op.f('uq_posts_rule_id_publish_time'), 'posts', type_='unique')
+    op.drop_constraint(op.f('fk_posts_rule_id_recurring_rules'), 'posts', type_='foreignkey')
+    op.drop_column('posts', 'rule_id')
+    op.drop_index(op.f('ix_recurring_rules_next_run'), table_name='recurring_rules')
+    op.drop_table('recurring_rules')
@@ -0,0 +1,30 @@
+"""Publication message ids
+
+Revision ID: 5b8e1c3f7a24
+Revises: 90355b272d0a
+Create Date: 2026-10-18 19:02:17.318452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1c3f7a24'
+down_revision: Union[str, None] = '90355b272d0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('message_ids', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+    op.add_column('post_targets', sa.Column('message_ids', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+    op.add_column('publish_outbox', sa.Column('message_ids', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('publish_outbox', 'message_ids')
+    op.drop_column('post_targets', 'message_ids')
+    op.drop_column('posts', 'message_ids')
@@ -0,0 +1,44 @@
+"""Publish retries and dead letters
+
+Revision ID: 90355b272d0a
+Revises: 18e33be202d7
+Create Date: 2026-10-18 18:12:50.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90355b272d0a'
+down_revision: Union[str, None] = '18e33be202d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Статус поста, исчерпавшего попытки публикации
+    op.execute("ALTER TYPE poststatus ADD VALUE IF NOT EXISTS 'FAILED'")
+    op.add_column('posts', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('posts', sa.Column('retry_at', sa.DateTime(), nullable=True))
+    op.create_table('dead_letters',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error_class', sa.String(length=64), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('failed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], name=op.f('fk_dead_letters_post_id_posts'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_dead_letters')),
+    sa.UniqueConstraint('post_id', name=op.f('uq_dead_letters_post_id'))
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dead_letters')
+    op.drop_column('posts', 'retry_at')
+    op.drop_column('posts', 'attempts')
+    # Postgres не умеет удалять значения enum, возвращаем упавшие посты в очередь
+    op.execute("UPDATE posts SET status = 'PENDING' WHERE status = 'FAILED'")
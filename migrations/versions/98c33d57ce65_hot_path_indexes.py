@@ -0,0 +1,40 @@
+"""Hot path indexes
+
+Revision ID: 98c33d57ce65
+Revises: 5b8e1c3f7a24
+Create Date: 2026-10-18 20:41:06.527913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '98c33d57ce65'
+down_revision: Union[str, None] = '5b8e1c3f7a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в posts и logs на время построения,
+    # но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index('ix_channels_is_active_name', 'channels', ['is_active', 'name', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_posts_channel_id'), 'posts', ['channel_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_posts_status_publish_time', 'posts', ['status', 'publish_time', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_logs_timestamp'), 'logs', ['timestamp'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_stats_channel_id'), 'stats', ['channel_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_stats_post_id'), 'stats', ['post_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_stats_post_id'), table_name='stats', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_stats_channel_id'), table_name='stats', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_logs_timestamp'), table_name='logs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_posts_status_publish_time', table_name='posts', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_posts_channel_id'), table_name='posts', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_channels_is_active_name', table_name='channels', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+"""Post publishing status
+
+Revision ID: c246daffe80c
+Revises: 03418d07a827
+Create Date: 2026-10-18 10:02:41.512307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c246daffe80c'
+down_revision: Union[str, None] = '03418d07a827'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Статус поста, захваченного диспетчером публикаций
+    op.execute("ALTER TYPE poststatus ADD VALUE IF NOT EXISTS 'PUBLISHING'")
+
+
+def downgrade() -> None:
+    # Postgres не умеет удалять значения enum, возвращаем захваченные посты в очередь
+    op.execute("UPDATE posts SET status = 'PENDING' WHERE status = 'PUBLISHING'")
@@ -0,0 +1,39 @@
+"""Post targets for cross-posting
+
+Revision ID: f972fd0ea088
+Revises: c246daffe80c
+Create Date: 2026-10-18 11:24:09.183645
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f972fd0ea088'
+down_revision: Union[str, None] = 'c246daffe80c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('post_targets',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('channel_id', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PUBLISHED', 'FAILED', name='targetstatus'), nullable=False),
+    sa.Column('message_id', sa.BigInteger(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('published', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['channel_id'], ['channels.id'], name=op.f('fk_post_targets_channel_id_channels')),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], name=op.f('fk_post_targets_post_id_posts'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_post_targets')),
+    sa.UniqueConstraint('post_id', 'channel_id', name=op.f('uq_post_targets_post_id_channel_id'))
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('post_targets')
+    sa.Enum(name='targetstatus').drop(op.get_bind(), checkfirst=True)
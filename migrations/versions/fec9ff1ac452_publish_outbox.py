@@ -0,0 +1,45 @@
+"""Publish outbox for exactly-once delivery
+
+Revision ID: fec9ff1ac452
+Revises: 4066edcd0473
+Create Date: 2026-10-18 14:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fec9ff1ac452'
+down_revision: Union[str, None] = '4066edcd0473'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('publish_outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('chat_id', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'CLAIMED', 'SENT', 'FAILED', name='outboxstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('claimed_by', sa.String(length=255), nullable=True),
+    sa.Column('claimed_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.Column('message_id', sa.BigInteger(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], name=op.f('fk_publish_outbox_post_id_posts'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_publish_outbox')),
+    sa.UniqueConstraint('key', name=op.f('uq_publish_outbox_key'))
+    )
+    op.create_index(op.f('ix_publish_outbox_post_id'), 'publish_outbox', ['post_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_publish_outbox_post_id'), table_name='publish_outbox')
+    op.drop_table('publish_outbox')
+    sa.Enum(name='outboxstatus').drop(op.get_bind(), checkfirst=True)
@@ -2,15 +2,20 @@ import asyncio
 
 from aiogram import Dispatcher, Bot
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.telegram import PRODUCTION, TelegramAPIServer
 from aiogram.fsm.storage.memory import MemoryStorage
 from loguru import logger
 
 from core.database import DatabaseManager
 from src.config import settings
+from src.handlers.manage_posts.shedule import global_storage
 from src.middlewares.db_middleware import DatabaseMiddleware
 from src.middlewares.logging_middleware import LoggingMiddleware
+from src.middlewares.ordered_middleware import OrderedUpdateMiddleware
 from src.utils.logger import setup_logging
+from src.utils.metrics import MetricsServer
 from src.utils.smart_session import SmartAiohttpSession
+from src.utils.update_executor import OrderedUpdateExecutor
 
 
 def setup_handlers(dp: Dispatcher) -> None:
@@ -28,6 +33,13 @@ def setup_handlers(dp: Dispatcher) -> None:
 
 
 def setup_middlewares(dp: Dispatcher) -> None:
+    update_executor = OrderedUpdateExecutor(
+        concurrency=settings.updates.concurrency,
+        max_pending=settings.updates.max_pending_per_key,
+    )
+    dp.workflow_data["update_executor"] = update_executor
+    # Первым: всё остальное выполняется уже в очереди чата/пользователя
+    dp.update.outer_middleware(OrderedUpdateMiddleware(update_executor, dp))
     dp.update.outer_middleware(DatabaseMiddleware())
     dp.update.middleware(LoggingMiddleware())
 
@@ -48,30 +60,48 @@ def setup_db(dispatcher: Dispatcher) -> None:
             max_overflow=settings.db.max_overflow,
         )
         dispatcher.workflow_data["db_manager"] = db_manager
+        global_storage["db_manager"] = db_manager
         logger.info("DB connect successful")
     except Exception as e:
         logger.error(f"Failed to connect to database: {e}")
         raise
 
 
+async def setup_metrics(dispatcher: Dispatcher) -> None:
+    if not settings.metrics.enabled:
+        return
+    metrics_server = MetricsServer(host=settings.metrics.host, port=settings.metrics.port)
+    await metrics_server.start()
+    dispatcher.workflow_data["metrics_server"] = metrics_server
+
+
 async def aiogram_on_startup_polling(dispatcher: Dispatcher, bot: Bot) -> None:
     await bot.delete_webhook(drop_pending_updates=True)
     await setup_aiogram(dispatcher)
+    await setup_metrics(dispatcher)
     logger.info("Bot started successfully")
 
 
 async def aiogram_on_shutdown_polling(dispatcher: Dispatcher, bot: Bot) -> None:
+    if update_executor := dispatcher.workflow_data.get("update_executor"):
+        await update_executor.close()
+    if metrics_server := dispatcher.workflow_data.get("metrics_server"):
+        await metrics_server.stop()
     await dispatcher.storage.close()
     await dispatcher.workflow_data["db_manager"].dispose()
     logger.info("DB connection closed")
     await bot.session.close()
     logger.info("Bot stopping successful")
 
-from src.handlers.manage_posts.shedule import global_storage
-
 def main() -> None:
     setup_logging(log_level="DEBUG", json_format=False)
-    smart_session = SmartAiohttpSession()
+    smart_session = SmartAiohttpSession(
+        api=(
+            TelegramAPIServer.from_base(settings.run.api_server)
+            if settings.run.api_server
+            else PRODUCTION
+        ),
+    )
     bot = Bot(
         token=settings.run.token,
         session=smart_session,
@@ -83,7 +113,8 @@ def main() -> None:
     dp.startup.register(aiogram_on_startup_polling)
     dp.shutdown.register(aiogram_on_shutdown_polling)
 
-    asyncio.run(dp.start_polling(bot))
+    # Параллельность и порядок апдейтов обеспечивает OrderedUpdateExecutor
+    asyncio.run(dp.start_polling(bot, handle_as_tasks=False))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+from aiogram import Dispatcher, Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.telegram import PRODUCTION, TelegramAPIServer
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+from loguru import logger
+
+from run_polling import aiogram_on_shutdown_polling, setup_aiogram, setup_metrics
+from src.config import settings
+from src.handlers.manage_posts.shedule import global_storage
+from src.utils.logger import setup_logging
+from src.utils.smart_session import SmartAiohttpSession
+from src.utils.webhook import WebhookServer
+
+
+async def aiogram_on_startup_webhook(dispatcher: Dispatcher, bot: Bot) -> None:
+    await setup_aiogram(dispatcher)
+    await setup_metrics(dispatcher)
+    # Апдейты, накопившиеся за время рестарта, не выбрасываем; повторный
+    # setWebhook с тем же адресом безопасен для нескольких реплик
+    await bot.set_webhook(
+        url=f"{settings.webhook.base_url.rstrip('/')}{settings.webhook.path}",
+        secret_token=settings.webhook.secret_token,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+        max_connections=settings.webhook.max_connections,
+        drop_pending_updates=False,
+    )
+    logger.info("Bot started successfully")
+
+
+def main() -> None:
+    setup_logging(log_level="DEBUG", json_format=False)
+    if not settings.webhook.base_url:
+        raise SystemExit("webhook.base_url is not set")
+    # Без секрета любой, кто узнал адрес, может слать апдейты от имени админа
+    if not settings.webhook.secret_token:
+        raise SystemExit("webhook.secret_token is not set")
+    smart_session = SmartAiohttpSession(
+        api=(
+            TelegramAPIServer.from_base(settings.run.api_server)
+            if settings.run.api_server
+            else PRODUCTION
+        ),
+    )
+    bot = Bot(
+        token=settings.run.token,
+        session=smart_session,
+        default=DefaultBotProperties(parse_mode="HTML"),
+    )
+    global_storage["bot"] = bot
+    storage = MemoryStorage()
+    dp = Dispatcher(bot=bot, storage=storage)
+    dp.startup.register(aiogram_on_startup_webhook)
+    # Вебхук не удаляем: его продолжают обслуживать остальные реплики
+    dp.shutdown.register(aiogram_on_shutdown_polling)
+
+    app = web.Application()
+    # Принятые апдейты дорабатываются в aiogram_on_shutdown_polling,
+    # до закрытия базы и сессии бота
+    WebhookServer(
+        dp,
+        bot,
+        secret_token=settings.webhook.secret_token,
+        path=settings.webhook.path,
+    ).setup(app)
+    setup_application(app, dp, bot=bot)
+    web.run_app(app, host=settings.webhook.host, port=settings.webhook.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import PostgresDsn
@@ -5,6 +7,8 @@ from pydantic import PostgresDsn
 
 class BotConfig(BaseModel):
     token: str
+    # Базовый URL Bot API, например локальный фейковый сервер для нагрузочных тестов
+    api_server: str | None = None
 
 
 class DBConfig(BaseModel):
@@ -22,6 +26,60 @@ class DBConfig(BaseModel):
     }
 
 
+class PublisherConfig(BaseModel):
+    batch_size: int = 100
+    workers: int = 8
+    poll_interval: float = 5.0
+    tick: float = 1.0
+    fanout_workers: int = 10
+    # Через сколько секунд захват записи outbox считается брошенным: с запасом
+    # больше худшей отправки альбома с ожиданием лимитера после 429
+    outbox_lease: float = 600.0
+    # За сколько секунд до publish_time готовить публикацию
+    stage_ahead: float = 30.0
+    stage_max_size: int = 10_000
+    # Окно и размер сводки уведомлений о публикациях
+    digest_window: float = 10.0
+    digest_max_events: int = 30
+    # Максимальная пауза между проверками повторяющихся правил
+    recurring_poll_interval: float = 30.0
+    # Что делать с просроченными постами при старте: all | skip | spread
+    catchup_policy: Literal["all", "skip", "spread"] = "all"
+    catchup_grace: float = 60.0
+    catchup_burst: int = 20
+    catchup_window: float = 1800.0
+
+
+class LeaderConfig(BaseModel):
+    # Ключ advisory lock, общий для всех реплик бота
+    lock_id: int = 7_301_726_571
+    retry_interval: float = 2.0
+    check_interval: float = 5.0
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = True
+    host: str = "0.0.0.0"
+    port: int = 9100
+
+
+class WebhookConfig(BaseModel):
+    # Публичный адрес, на который Telegram шлёт апдейты (без пути)
+    base_url: str | None = None
+    path: str = "/webhook"
+    secret_token: str | None = None
+    host: str = "0.0.0.0"
+    port: int = 8080
+    max_connections: int = 40
+
+
+class UpdatesConfig(BaseModel):
+    # Сколько апдейтов обрабатывать одновременно; апдейты одного
+    # чата/пользователя всегда идут по очереди
+    concurrency: int = 16
+    max_pending_per_key: int = 100
+
+
 class PgAdminConfig(BaseModel):
     email: str
     password: str
@@ -38,6 +96,11 @@ class Settings(BaseSettings):
     run: BotConfig
     db: DBConfig
     pgadmin: PgAdminConfig
+    publisher: PublisherConfig = PublisherConfig()
+    leader: LeaderConfig = LeaderConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    webhook: WebhookConfig = WebhookConfig()
+    updates: UpdatesConfig = UpdatesConfig()
 
 
 settings = Settings()
@@ -1,16 +1,36 @@
-from datetime import datetime
+"""Запросы к базе.
 
-from sqlalchemy import select
+Транзакцией управляет вызывающий (DatabaseManager.unit_of_work): функции
+не коммитят и не закрывают сессию, поэтому несколько вызовов за один апдейт
+работают в одной транзакции на одном соединении.
+"""
+from datetime import datetime, timedelta
+from typing import AsyncIterator
+
+from sqlalchemy import select, update, func, delete, bindparam, or_, and_, tuple_, inspect
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.core.models import Channel, Post, PostStatus, User
+from src.core.pagination import Page, decode_cursor, make_page
+from src.core.recurrence import next_occurrence, validate_rule
+from src.core.models import (
+    Channel,
+    DeadLetter,
+    OutboxStatus,
+    Post,
+    PostStatus,
+    PostTarget,
+    PublishOutbox,
+    RecurringRule,
+    TargetStatus,
+    User,
+)
 
 
 # Channel CRUD operations
 async def get_all_channels(session: AsyncSession):
     result = await session.execute(select(Channel))
-    await session.close()
     return result.scalars().all()
 
 
@@ -18,7 +38,6 @@ async def get_active_channels(session: AsyncSession):
     result = await session.execute(
         select(Channel).where(Channel.is_active == True)
     )
-    await session.close()
     return result.scalars().all()
 
 
@@ -26,17 +45,42 @@ async def get_inactive_channels(session: AsyncSession):
     result = await session.execute(
         select(Channel).where(Channel.is_active == False)
     )
-    await session.close()
     return result.scalars().all()
 
 
+async def get_active_channel_ids(session: AsyncSession, channel_ids: list[int]) -> set[int]:
+    """Какие из channel_ids - активные каналы"""
+    result = await session.execute(
+        select(Channel.id).where(Channel.id.in_(channel_ids), Channel.is_active == True)
+    )
+    return set(result.scalars().all())
+
+
+async def get_channels_page(
+    session: AsyncSession,
+    is_active: bool | None = None,
+    cursor: str | None = None,
+    limit: int = 5,
+) -> Page[Channel]:
+    """Страница каналов по (name, id) после курсора; is_active=None - все каналы"""
+    stmt = select(Channel)
+    if is_active is not None:
+        stmt = stmt.where(Channel.is_active == is_active)
+    if cursor:
+        name, channel_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Channel.name, Channel.id) > tuple_(name, channel_id))
+    result = await session.execute(
+        stmt.order_by(Channel.name, Channel.id).limit(limit + 1)
+    )
+    return make_page(result.scalars().all(), limit, lambda c: (c.name, c.id))
+
+
 async def get_channel_by_id(session: AsyncSession, channel_id: int):
     result = await session.execute(
         select(Channel)
         .where(Channel.id == channel_id)
         .options(selectinload(Channel.posts), )
     )
-    await session.close()
     return result.scalar_one_or_none()
 
 
@@ -45,23 +89,20 @@ async def add_channel(session: AsyncSession, channel: Channel):
         session.add(channel)
     except Exception as e:
         raise ValueError("Channel already exists")
-    await session.commit()
+    await session.flush()
     await session.refresh(channel)
-    await session.close()
     return channel
 
 
 async def update_channel(session: AsyncSession, channel: Channel):
     await session.merge(channel)
-    await session.commit()
-    await session.close()
+    await session.flush()
     return channel
 
 
 async def delete_channel(session: AsyncSession, channel: Channel):
     await session.delete(channel)
-    await session.commit()
-    await session.close()
+    await session.flush()
 
 
 # Post CRUD operations
@@ -72,7 +113,6 @@ async def get_pending_posts(session: AsyncSession):
         .options(selectinload(Post.creator), selectinload(Post.channel))
         .order_by(Post.publish_time)
     )
-    await session.close()
     return result.scalars().all()
 
 
@@ -83,7 +123,6 @@ async def get_published_posts(session: AsyncSession):
         .options(selectinload(Post.creator), selectinload(Post.channel))
         .order_by(Post.publish_time.desc())
     )
-    await session.close()
     return result.scalars().all()
 
 
@@ -93,10 +132,36 @@ async def get_cancelled_posts(session: AsyncSession):
         .where(Post.status == PostStatus.CANCELLED)
         .options(selectinload(Post.creator), selectinload(Post.channel))
     )
-    await session.close()
     return result.scalars().all()
 
 
+async def get_posts_page(
+    session: AsyncSession,
+    status: PostStatus,
+    cursor: str | None = None,
+    limit: int = 5,
+) -> Page[Post]:
+    """Страница постов со статусом status по (publish_time, id) после курсора.
+
+    Опубликованные идут от новых к старым, остальные - от ближайших. Ключ
+    уникален, поэтому страницы не теряют и не повторяют посты с одинаковым
+    временем, а стоимость страницы не зависит от её номера.
+    """
+    key = tuple_(Post.publish_time, Post.id)
+    descending = status == PostStatus.PUBLISHED
+    stmt = select(Post).where(Post.status == status)
+    if cursor:
+        publish_time, post_id = decode_cursor(cursor)
+        bound = tuple_(datetime.fromisoformat(publish_time), post_id)
+        stmt = stmt.where(key < bound if descending else key > bound)
+    if descending:
+        stmt = stmt.order_by(Post.publish_time.desc(), Post.id.desc())
+    else:
+        stmt = stmt.order_by(Post.publish_time, Post.id)
+    result = await session.execute(stmt.limit(limit + 1))
+    return make_page(result.scalars().all(), limit, lambda p: (p.publish_time, p.id))
+
+
 async def get_post_by_id(session: AsyncSession, post_id: int):
     result = await session.execute(
         select(Post)
@@ -104,32 +169,480 @@ async def get_post_by_id(session: AsyncSession, post_id: int):
         .options(
             selectinload(Post.creator),
             selectinload(Post.channel),
-            selectinload(Post.stats)
+            selectinload(Post.stats),
         )
     )
-    await session.close()
     return result.scalar_one_or_none()
 
 
 async def add_post(session: AsyncSession, post: Post):
     session.add(post)
-    await session.commit()
+    await session.flush()
     await session.refresh(post)
-    await session.close()
     return post
 
 
 async def update_post(session: AsyncSession, post: Post):
-    await session.merge(post)
-    await session.commit()
-    await session.close()
+    """Записывает изменённые колонки поста одним UPDATE по id.
+
+    Пост обычно отсоединён и лежит в FSM. merge записал бы поверх свежей
+    строки весь устаревший снимок: статус, итоги целей кросспостинга и
+    сами цели, которые с тех пор мог сменить диспетчер.
+    """
+    state = inspect(post)
+    values = {
+        attr.key: attr.value
+        for attr in state.attrs
+        if attr.key in state.mapper.column_attrs and attr.history.has_changes()
+    }
+    if values:
+        await session.execute(
+            update(Post)
+            .where(Post.id == post.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
     return post
 
 
 async def delete_post(session: AsyncSession, post: Post):
     await session.delete(post)
-    await session.commit()
-    await session.close()
+    await session.flush()
+
+
+async def get_posts_for_publish(session: AsyncSession, post_ids: list[int]):
+    """Модель чтения для публикации: один запрос, только нужные для отправки поля.
+
+    Канал присоединяется JOIN-ом, каналы кросспостинга, куда пост ещё не ушёл,
+    собираются array_agg в подзапросе. Ни статистика, ни посты канала не читаются.
+    """
+    pending_targets = (
+        select(func.array_agg(PostTarget.channel_id))
+        .where(
+            PostTarget.post_id == Post.id,
+            PostTarget.status != TargetStatus.PUBLISHED,
+        )
+        .correlate(Post)
+        .scalar_subquery()
+    )
+    cross_posted = (
+        select(PostTarget.id).where(PostTarget.post_id == Post.id).correlate(Post).exists()
+    )
+    result = await session.execute(
+        select(
+            Post.id,
+            Post.updated_at,
+            Post.publish_time,
+            Post.status,
+            Post.title,
+            Post.text,
+            Post.photos,
+            Post.videos,
+            Post.document,
+            Post.channel_id,
+            Channel.name.label("channel_name"),
+            Channel.notification_chat_id,
+            pending_targets.label("targets"),
+            cross_posted.label("cross_posted"),
+        )
+        .join(Channel, Channel.id == Post.channel_id)
+        .where(
+            Post.id.in_(post_ids),
+            Post.status.in_([PostStatus.PENDING, PostStatus.PUBLISHING]),
+        )
+    )
+    return result.all()
+
+
+async def mark_post_published(
+    session: AsyncSession, post_id: int, message_ids: list[int] | None
+):
+    await session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            status=PostStatus.PUBLISHED,
+            message_id=message_ids[0] if message_ids else None,
+            message_ids=message_ids,
+            published=datetime.now(),
+            retry_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+# Recurring rules
+async def add_recurring_rule(session: AsyncSession, rule: RecurringRule):
+    """Сохраняет правило с рассчитанным первым срабатыванием.
+
+    Без next_run правило не попадёт в выборку RecurringExpander и не сработает.
+    """
+    validate_rule(rule.cron, rule.interval)
+    rule.next_run = next_occurrence(rule, rule.start_at - timedelta(microseconds=1))
+    session.add(rule)
+    await session.flush()
+    await session.refresh(rule)
+    return rule
+
+
+async def get_active_rules(session: AsyncSession):
+    result = await session.execute(
+        select(RecurringRule)
+        .where(RecurringRule.is_active == True)
+        .options(selectinload(RecurringRule.channel))
+        .order_by(RecurringRule.next_run)
+    )
+    return result.scalars().all()
+
+
+async def deactivate_rule(session: AsyncSession, rule_id: int):
+    await session.execute(
+        update(RecurringRule)
+        .where(RecurringRule.id == rule_id)
+        .values(is_active=False, next_run=None)
+    )
+
+
+# Cross-posting targets
+async def get_post_targets(session: AsyncSession, post_id: int):
+    result = await session.execute(
+        select(PostTarget)
+        .where(PostTarget.post_id == post_id)
+        .order_by(PostTarget.id)
+    )
+    return result.scalars().all()
+
+
+async def set_post_targets(session: AsyncSession, post_id: int, channel_ids: list[int]):
+    """Заменяет список каналов кросспостинга, не трогая уже опубликованные цели"""
+    await session.execute(
+        delete(PostTarget).where(
+            PostTarget.post_id == post_id,
+            PostTarget.status != TargetStatus.PUBLISHED,
+            PostTarget.channel_id.not_in(channel_ids),
+        )
+    )
+    existing = await session.execute(
+        select(PostTarget.channel_id).where(PostTarget.post_id == post_id)
+    )
+    known = set(existing.scalars().all())
+    session.add_all(
+        PostTarget(post_id=post_id, channel_id=channel_id)
+        for channel_id in dict.fromkeys(channel_ids)
+        if channel_id not in known
+    )
+    await session.flush()
+    # Смена целей меняет публикацию, подготовленные заранее данные устаревают
+    await session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def save_target_results(session: AsyncSession, post_id: int, results: list[dict]):
+    """Одним executemany сохраняет итоги публикации по каждому каналу.
+
+    Элементы results: channel_id, status, message_ids, error, published.
+    """
+    if not results:
+        return
+    table = PostTarget.__table__
+    await session.execute(
+        update(table)
+        .where(
+            table.c.post_id == bindparam("b_post_id"),
+            table.c.channel_id == bindparam("b_channel_id"),
+        )
+        .values(
+            {
+                name: bindparam(f"b_{name}", type_=table.c[name].type)
+                for name in ("status", "message_id", "message_ids", "error", "published")
+            }
+        ),
+        [
+            {
+                "b_post_id": post_id,
+                "b_channel_id": result["channel_id"],
+                "b_status": result["status"],
+                "b_message_id": (result.get("message_ids") or [None])[0],
+                "b_message_ids": result.get("message_ids"),
+                "b_error": result.get("error"),
+                "b_published": result.get("published"),
+            }
+            for result in results
+        ],
+    )
+
+
+# Publish dispatcher
+async def claim_due_posts(
+    session: AsyncSession, now: datetime, limit: int
+) -> list[tuple[int, datetime, int]]:
+    """Атомарно захватывает пачку созревших постов (PENDING -> PUBLISHING).
+
+    FOR UPDATE SKIP LOCKED позволяет нескольким диспетчерам работать
+    параллельно, не блокируя друг друга и не захватывая одни и те же строки.
+    Возвращает (id, updated_at, attempts); захват не меняет updated_at, поэтому
+    по нему можно проверить, не устарела ли заранее подготовленная публикация.
+    Посты из очереди повторов захватываются не раньше retry_at.
+    """
+    due = (
+        select(Post.id)
+        .where(
+            Post.status == PostStatus.PENDING,
+            Post.publish_time <= now,
+            or_(Post.retry_at.is_(None), Post.retry_at <= now),
+        )
+        .order_by(Post.publish_time)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(Post)
+        .where(Post.id.in_(due))
+        .values(status=PostStatus.PUBLISHING, updated_at=Post.updated_at)
+        .returning(Post.id, Post.updated_at, Post.attempts)
+        .execution_options(synchronize_session=False)
+    )
+    claimed = [tuple(row) for row in result.all()]
+    return claimed
+
+
+async def get_next_publish_time(session: AsyncSession) -> datetime | None:
+    result = await session.execute(
+        select(func.min(Post.publish_time)).where(Post.status == PostStatus.PENDING)
+    )
+    return result.scalar()
+
+
+async def release_posts(session: AsyncSession, post_ids: list[int] | None = None):
+    """Возвращает захваченные посты в очередь (PUBLISHING -> PENDING).
+
+    Без post_ids освобождает все захваченные посты, например после падения бота.
+    """
+    stmt = update(Post).where(Post.status == PostStatus.PUBLISHING)
+    if post_ids is not None:
+        stmt = stmt.where(Post.id.in_(post_ids))
+    result = await session.execute(
+        stmt.values(
+            status=PostStatus.PENDING, updated_at=Post.updated_at
+        ).execution_options(
+            synchronize_session=False
+        )
+    )
+    return result.rowcount
+
+
+# Retry queue and dead letters
+async def schedule_post_retry(
+    session: AsyncSession, post_id: int, attempts: int, retry_at: datetime
+):
+    """Возвращает упавший пост в очередь с отложенной попыткой"""
+    await session.execute(
+        update(Post)
+        .where(Post.id == post_id, Post.status == PostStatus.PUBLISHING)
+        .values(
+            status=PostStatus.PENDING,
+            attempts=attempts,
+            retry_at=retry_at,
+            updated_at=Post.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def dead_letter_post(
+    session: AsyncSession,
+    post_id: int,
+    attempts: int,
+    error_class: str,
+    error: str,
+):
+    """Переводит пост, исчерпавший попытки, в FAILED и пишет его в dead_letters"""
+    await session.execute(
+        update(Post)
+        .where(Post.id == post_id, Post.status == PostStatus.PUBLISHING)
+        .values(
+            status=PostStatus.FAILED,
+            attempts=attempts,
+            retry_at=None,
+            updated_at=Post.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    stmt = insert(DeadLetter).values(
+        post_id=post_id,
+        attempts=attempts,
+        error_class=error_class,
+        last_error=error,
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DeadLetter.post_id],
+            set_={
+                "attempts": stmt.excluded.attempts,
+                "error_class": stmt.excluded.error_class,
+                "last_error": stmt.excluded.last_error,
+                "failed_at": func.now(),
+            },
+        )
+    )
+
+
+async def get_dead_letters(session: AsyncSession):
+    result = await session.execute(
+        select(DeadLetter)
+        .options(selectinload(DeadLetter.post))
+        .order_by(DeadLetter.failed_at.desc())
+    )
+    return result.scalars().all()
+
+
+async def retry_dead_letters(session: AsyncSession) -> list[tuple[datetime, int]]:
+    """Возвращает все посты из dead_letters в очередь одним запросом.
+
+    Счётчик попыток сбрасывается, возвращает (publish_time, id) для диспетчера.
+    """
+    failed = select(DeadLetter.post_id).scalar_subquery()
+    result = await session.execute(
+        update(Post)
+        .where(Post.id.in_(failed), Post.status == PostStatus.FAILED)
+        .values(status=PostStatus.PENDING, attempts=0, retry_at=None)
+        .returning(Post.publish_time, Post.id)
+        .execution_options(synchronize_session=False)
+    )
+    retried = [tuple(row) for row in result.all()]
+    await session.execute(
+        delete(DeadLetter).where(DeadLetter.post_id.in_([post_id for _, post_id in retried]))
+    )
+    return retried
+
+
+# Publish outbox
+def outbox_key(post_id: int, chat_id: int) -> str:
+    return f"post:{post_id}:chat:{chat_id}"
+
+
+async def enqueue_outbox(session: AsyncSession, post_id: int, chat_ids: list[int]):
+    """Создаёт записи отправки поста в каждый чат, существующие не трогает"""
+    if not chat_ids:
+        return
+    await session.execute(
+        insert(PublishOutbox)
+        .values(
+            [
+                {
+                    "key": outbox_key(post_id, chat_id),
+                    "post_id": post_id,
+                    "chat_id": chat_id,
+                    "status": OutboxStatus.PENDING,
+                    "attempts": 0,
+                }
+                for chat_id in dict.fromkeys(chat_ids)
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=[PublishOutbox.key])
+    )
+
+
+async def claim_outbox_entries(
+    session: AsyncSession,
+    post_id: int,
+    chat_ids: list[int],
+    worker: str,
+    lease: float,
+) -> list[tuple[int, int, list[int] | None]]:
+    """Захватывает неотправленные записи поста в chat_ids.
+
+    Возвращает (id, chat_id, message_ids): message_ids - сообщения, отправленные
+    прошлой попыткой, упавшей на середине альбома.
+
+    Забираются PENDING и FAILED записи, а также CLAIMED, чья аренда истекла
+    (обработчик упал между захватом и фиксацией). SKIP LOCKED не даёт двум
+    обработчикам взять одну запись, SENT не захватывается никогда.
+    """
+    now = datetime.now()
+    claimable = (
+        select(PublishOutbox.id)
+        .where(
+            PublishOutbox.post_id == post_id,
+            PublishOutbox.chat_id.in_(chat_ids),
+            or_(
+                PublishOutbox.status.in_([OutboxStatus.PENDING, OutboxStatus.FAILED]),
+                and_(
+                    PublishOutbox.status == OutboxStatus.CLAIMED,
+                    PublishOutbox.claimed_at < now - timedelta(seconds=lease),
+                ),
+            ),
+        )
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(PublishOutbox)
+        .where(PublishOutbox.id.in_(claimable))
+        .values(
+            status=OutboxStatus.CLAIMED,
+            claimed_by=worker,
+            claimed_at=now,
+            attempts=PublishOutbox.attempts + 1,
+        )
+        .returning(PublishOutbox.id, PublishOutbox.chat_id, PublishOutbox.message_ids)
+        .execution_options(synchronize_session=False)
+    )
+    entries = [tuple(row) for row in result.all()]
+    return entries
+
+
+async def complete_outbox_entries(session: AsyncSession, worker: str, results: list[dict]):
+    """Фиксирует итог отправки захваченных записей.
+
+    Элементы results: id, status (SENT или FAILED), message_ids, error.
+    У FAILED message_ids - часть альбома, успевшая уйти до ошибки.
+    Обновляются только записи, всё ещё захваченные этим обработчиком:
+    если аренду перехватили, итог фиксирует новый владелец.
+    """
+    if not results:
+        return
+    table = PublishOutbox.__table__
+    now = datetime.now()
+    await session.execute(
+        update(table)
+        .where(
+            table.c.id == bindparam("b_id"),
+            table.c.status == OutboxStatus.CLAIMED,
+            table.c.claimed_by == worker,
+        )
+        .values(
+            {
+                name: bindparam(f"b_{name}", type_=table.c[name].type)
+                for name in ("status", "message_id", "message_ids", "error", "sent_at")
+            }
+        ),
+        [
+            {
+                "b_id": result["id"],
+                "b_status": result["status"],
+                "b_message_id": (result.get("message_ids") or [None])[0],
+                "b_message_ids": result.get("message_ids"),
+                "b_error": result.get("error"),
+                "b_sent_at": now if result["status"] == OutboxStatus.SENT else None,
+            }
+            for result in results
+        ],
+    )
+
+
+async def get_outbox_entries(session: AsyncSession, post_id: int) -> list[PublishOutbox]:
+    result = await session.execute(
+        select(PublishOutbox)
+        .where(PublishOutbox.post_id == post_id)
+        .order_by(PublishOutbox.id)
+    )
+    return result.scalars().all()
 
 
 # TODO:пока набросок,нужно доработать и протестить
@@ -139,7 +652,6 @@ async def get_user_by_id(session: AsyncSession, user_id: int):
         select(User)
         .where(User.id == user_id)
          )
-    await session.close()
     return result.scalar_one_or_none()
 
 async def get_all_posts_from_channel(session: AsyncSession, channel_id: int):
@@ -150,3 +662,75 @@ async def get_all_posts_from_user(session: AsyncSession, user_id: int):
     user = await get_user_by_id(session, user_id)
     return  user.posts
 
+
+
+async def stream_pending_schedule(
+    session: AsyncSession, chunk_size: int = 5000
+) -> AsyncIterator[list[tuple[datetime, int]]]:
+    """Потоково отдаёт (время выхода, id) ожидающих постов в порядке publish_time.
+
+    Время выхода - publish_time или более поздний retry_at (повтор, темп
+    догоняния). Читаются только нужные колонки через серверный курсор, без
+    ORM-объектов, поэтому память и время не зависят от размера текстов и медиа.
+    """
+    result = await session.stream(
+        select(Post.id, func.greatest(Post.publish_time, Post.retry_at))
+        .where(Post.status == PostStatus.PENDING)
+        .order_by(Post.publish_time, Post.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    async for partition in result.partitions():
+        yield [(publish_time, post_id) for post_id, publish_time in partition]
+
+
+async def cancel_overdue_posts(session: AsyncSession, cutoff: datetime) -> int:
+    result = await session.execute(
+        update(Post)
+        .where(Post.status == PostStatus.PENDING, Post.publish_time < cutoff)
+        .values(status=PostStatus.CANCELLED)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def pace_overdue_posts(
+    session: AsyncSession,
+    cutoff: datetime,
+    start: datetime,
+    burst: int | None = None,
+    window: float | None = None,
+) -> int:
+    """Одним UPDATE растягивает выход просроченных постов во времени после start.
+
+    С burst выходит не больше burst постов в секунду, с window посты
+    равномерно распределяются по окну (секунды). Темп задаётся через retry_at,
+    которое уважает захват: publish_time, заданное пользователем, не меняется,
+    и задержка публикации считается от него. Порядок публикации сохраняется.
+    """
+    overdue = (
+        select(
+            Post.id,
+            (
+                func.row_number().over(order_by=(Post.publish_time, Post.id)) - 1
+            ).label("rn"),
+            func.count().over().label("total"),
+        )
+        .where(Post.status == PostStatus.PENDING, Post.publish_time < cutoff)
+        .subquery()
+    )
+    if burst:
+        offset = overdue.c.rn // burst
+    else:
+        offset = overdue.c.rn * (window or 0) / overdue.c.total
+    result = await session.execute(
+        update(Post)
+        .where(Post.id == overdue.c.id)
+        .values(
+            retry_at=func.greatest(
+                Post.retry_at, start + func.make_interval(0, 0, 0, 0, 0, 0, offset)
+            ),
+            updated_at=Post.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from src.config import settings
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
@@ -61,6 +64,17 @@ class DatabaseManager:
         async with self.session_factory() as session:
             yield session
 
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[AsyncSession]:
+        """Одна транзакция на единицу работы: коммит в конце, откат при ошибке"""
+        async with self.session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+
 db_manager = DatabaseManager(
     url=str(settings.db.url),
     echo=settings.db.echo,
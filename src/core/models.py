@@ -9,7 +9,11 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum,
+    Index,
+    Float,
+    LargeBinary,
     MetaData,
+    UniqueConstraint,
 )
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
@@ -31,8 +35,23 @@ class UserRole(enum.Enum):
 
 class PostStatus(enum.Enum):
     PENDING = "pending"
+    PUBLISHING = "publishing"
     PUBLISHED = "published"
     CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class OutboxStatus(enum.Enum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class TargetStatus(enum.Enum):
+    PENDING = "pending"
+    PUBLISHED = "published"
+    FAILED = "failed"
 
 
 class User(Base):
@@ -67,6 +86,9 @@ class Channel(Base):
         DateTime, server_default=func.now(), onupdate=func.now()
     )
 
+    # Списки каналов фильтруются по активности и листаются по (name, id)
+    __table_args__ = (Index("ix_channels_is_active_name", "is_active", "name", "id"),)
+
     posts = relationship("Post", back_populates="channel")
     stats = relationship("Stat", back_populates="channel")
 
@@ -76,7 +98,7 @@ class Post(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     channel_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("channels.id"), nullable=False
+        BigInteger, ForeignKey("channels.id"), nullable=False, index=True
     )
     title: Mapped[str] = mapped_column(Text, nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False)
@@ -86,6 +108,8 @@ class Post(Base):
     publish_time: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
     published: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
     message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Все сообщения публикации: альбом больше 10 файлов уходит несколькими группами
+    message_ids: Mapped[list[int] | None] = mapped_column(ARRAY(BigInteger), nullable=True)
     status: Mapped[PostStatus] = mapped_column(
         Enum(PostStatus, name="poststatus"),
         nullable=False,
@@ -94,15 +118,99 @@ class Post(Base):
     created_by: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("users.id"), nullable=False
     )
+    # Неудачные попытки публикации и время следующей (очередь повторов)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    retry_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    # Правило, из которого создан пост повторяющегося расписания
+    rule_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("recurring_rules.id", ondelete="SET NULL"), nullable=True
+    )
     created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        UniqueConstraint("rule_id", "publish_time"),
+        # Очередь публикации и списки постов: фильтр по статусу, порядок и
+        # keyset-пагинация по (publish_time, id). Частичный индекс по статусу
+        # не подходит: crud передаёт статус параметром, и общий план
+        # подготовленного запроса не может доказать условие индекса
+        Index("ix_posts_status_publish_time", "status", "publish_time", "id"),
+    )
+
     # Relationships
     creator: Mapped["User"] = relationship("User", back_populates="posts")
     channel: Mapped["Channel"] = relationship("Channel", back_populates="posts")
     stats: Mapped[list["Stat"]] = relationship("Stat", back_populates="post")
+    # Цели меняет диспетчер, поэтому их не держат в снимке поста: без
+    # delete-orphan, а при удалении поста строки удаляет ON DELETE CASCADE
+    targets: Mapped[list["PostTarget"]] = relationship(
+        "PostTarget", back_populates="post", cascade="all", passive_deletes=True
+    )
+
+
+class RecurringRule(Base):
+    """Повторяющееся расписание: одна строка вместо поста на каждое повторение.
+
+    Хранится только ближайшее срабатывание next_run; пост создаётся из правила
+    в момент срабатывания, после чего next_run сдвигается на следующее.
+    """
+
+    __tablename__ = "recurring_rules"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    channel_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("channels.id"), nullable=False
+    )
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    photos: Mapped[list[str]] = mapped_column(ARRAY(String), default=None)
+    videos: Mapped[list[str]] = mapped_column(ARRAY(String), default=None)
+    document: Mapped[str] = mapped_column(String(255), nullable=True, default=None)
+    # Задаётся ровно одно: crontab-выражение или интервал в секундах
+    cron: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    interval: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    start_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+    end_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    next_run: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True, index=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    created_by: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.id"), nullable=False
+    )
+    created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
+
+    channel: Mapped["Channel"] = relationship("Channel")
+
+
+class PostTarget(Base):
+    """Канал кросспостинга: один пост публикуется в несколько каналов"""
+
+    __tablename__ = "post_targets"
+    __table_args__ = (UniqueConstraint("post_id", "channel_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False
+    )
+    channel_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("channels.id"), nullable=False
+    )
+    status: Mapped[TargetStatus] = mapped_column(
+        Enum(TargetStatus, name="targetstatus"),
+        nullable=False,
+        default=TargetStatus.PENDING,
+    )
+    message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    message_ids: Mapped[list[int] | None] = mapped_column(ARRAY(BigInteger), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    published: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+
+    post: Mapped["Post"] = relationship("Post", back_populates="targets")
+    channel: Mapped["Channel"] = relationship("Channel")
 
 
 class Log(Base):
@@ -117,7 +225,7 @@ class Log(Base):
     channel_id: Mapped[int | None] = mapped_column(
         BigInteger, ForeignKey("channels.id"), nullable=True
     )
-    timestamp: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
+    timestamp: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), index=True)
 
     user = relationship("User", back_populates="logs")
     channel = relationship("Channel")
@@ -128,10 +236,10 @@ class Stat(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     channel_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("channels.id"), nullable=False
+        BigInteger, ForeignKey("channels.id"), nullable=False, index=True
     )
     post_id: Mapped[int | None] = mapped_column(
-        Integer, ForeignKey("posts.id"), nullable=True
+        Integer, ForeignKey("posts.id"), nullable=True, index=True
     )
     views: Mapped[int] = mapped_column(Integer, default=0)
     comments: Mapped[int] = mapped_column(Integer, default=0)
@@ -139,3 +247,63 @@ class Stat(Base):
 
     channel = relationship("Channel", back_populates="stats")
     post = relationship("Post", back_populates="stats")
+
+
+class PublishOutbox(Base):
+    """Журнал попыток отправки: одна строка на пару пост-чат.
+
+    Детерминированный key не даёт создать вторую отправку того же поста в тот
+    же чат, а статус SENT фиксируется сразу после ответа Telegram, поэтому
+    после падения бота отправленное повторно не уходит.
+    """
+
+    __tablename__ = "publish_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    key: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(OutboxStatus, name="outboxstatus"),
+        nullable=False,
+        default=OutboxStatus.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    claimed_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    claimed_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    sent_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Уже отправленные сообщения; у упавшей на середине альбома записи повтор
+    # продолжает со следующей группы
+    message_ids: Mapped[list[int] | None] = mapped_column(ARRAY(BigInteger), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
+
+
+class DeadLetter(Base):
+    """Пост, исчерпавший попытки публикации, с последней ошибкой"""
+
+    __tablename__ = "dead_letters"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    error_class: Mapped[str] = mapped_column(String(64), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    failed_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
+
+    post: Mapped["Post"] = relationship("Post")
+
+
+class SchedulerJob(Base):
+    """Задачи APScheduler, схема совпадает с SQLAlchemyJobStore"""
+
+    __tablename__ = "apscheduler_jobs"
+
+    id: Mapped[str] = mapped_column(String(191), primary_key=True)
+    next_run_time: Mapped[float | None] = mapped_column(Float(25), index=True)
+    job_state: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
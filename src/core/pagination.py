@@ -0,0 +1,36 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """Страница keyset-пагинации: элементы и курсор следующей страницы"""
+
+    items: list[T]
+    next_cursor: str | None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(*values) -> str:
+    """Курсор - ключ сортировки последнего элемента страницы"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+
+def make_page(rows: list[T], limit: int, key) -> Page[T]:
+    """Собирает страницу из limit + 1 строк: лишняя строка лишь говорит, что есть следующая"""
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(*key(items[-1])) if len(rows) > limit else None
+    return Page(items=items, next_cursor=next_cursor)
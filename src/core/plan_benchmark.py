@@ -0,0 +1,333 @@
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import DatabaseManager
+from src.core.models import User, UserRole
+
+# Диапазон ID каналов бенчмарка, не пересекается с бенчмарком публикации
+FIRST_CHANNEL_ID = -1008000000000
+BENCHMARK_USER_ID = 1
+# Ожидающие посты сдвинуты далеко в будущее, чтобы диспетчер их не опубликовал
+PENDING_OFFSET = timedelta(days=3650)
+# Индексы миграции 98c33d57ce65: «до» - это план без них
+HOT_PATH_INDEXES = (
+    "ix_channels_is_active_name",
+    "ix_posts_channel_id",
+    "ix_posts_status_publish_time",
+    "ix_logs_timestamp",
+    "ix_stats_channel_id",
+    "ix_stats_post_id",
+)
+
+# Типы параметров запросов, как их передаёт asyncpg
+PARAM_TYPES = {
+    "status": "poststatus",
+    "now": "timestamp",
+    "limit": "integer",
+    "channel_id": "bigint",
+    "post_id": "integer",
+}
+
+# Запросы горячих путей в том виде, в каком их строит crud: значения, кроме
+# булевых констант, приходят параметрами. Параметры - (имя, значение) по
+# порядку $1, $2...; None берётся из общих параметров прогона
+QUERIES = {
+    "claim_due_posts": (
+        """
+        SELECT id FROM posts
+        WHERE status = $1 AND publish_time <= $2
+          AND (retry_at IS NULL OR retry_at <= $2)
+        ORDER BY publish_time LIMIT $3
+        FOR UPDATE SKIP LOCKED
+        """,
+        (("status", "PENDING"), ("now", None), ("limit", 100)),
+    ),
+    "next_publish_time": (
+        "SELECT min(publish_time) FROM posts WHERE status = $1",
+        (("status", "PENDING"),),
+    ),
+    "pending_posts_page": (
+        "SELECT * FROM posts WHERE status = $1 ORDER BY publish_time, id LIMIT $2",
+        (("status", "PENDING"), ("limit", 6)),
+    ),
+    "published_posts_page": (
+        "SELECT * FROM posts WHERE status = $1 ORDER BY publish_time DESC, id DESC LIMIT $2",
+        (("status", "PUBLISHED"), ("limit", 6)),
+    ),
+    "channel_posts": (
+        "SELECT id FROM posts WHERE channel_id = $1",
+        (("channel_id", None),),
+    ),
+    "active_channels_page": (
+        "SELECT * FROM channels WHERE is_active = true ORDER BY name, id LIMIT $1",
+        (("limit", 6),),
+    ),
+    "latest_logs": (
+        "SELECT * FROM logs ORDER BY timestamp DESC LIMIT $1",
+        (("limit", 20),),
+    ),
+    "post_stats": (
+        "SELECT sum(views), sum(comments) FROM stats WHERE post_id = $1",
+        (("post_id", None),),
+    ),
+    "channel_stats": (
+        "SELECT sum(views), sum(comments) FROM stats WHERE channel_id = $1",
+        (("channel_id", None),),
+    ),
+}
+
+
+@dataclass
+class PlanBenchmarkConfig:
+    channels: int = 100
+    posts: int = 1_000_000
+    logs: int = 1_000_000
+    # Доля ожидающих публикации постов, остальные опубликованы или отменены
+    pending_share: float = 0.05
+    # Прогонов на запрос, в отчёт идёт самый быстрый (с прогретым кешем)
+    repeat: int = 3
+
+
+@dataclass
+class QueryPlan:
+    query: str
+    before_ms: float
+    after_ms: float
+    before_buffers: int
+    after_buffers: int
+    before_plan: str
+    after_plan: str
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def channel_ids(config: PlanBenchmarkConfig) -> tuple[int, int]:
+    """Границы диапазона ID каналов бенчмарка (min, max)"""
+    return FIRST_CHANNEL_ID - config.channels + 1, FIRST_CHANNEL_ID
+
+
+async def seed(db_manager: DatabaseManager, config: PlanBenchmarkConfig) -> bool:
+    """Генерирует данные на стороне базы; False, если они уже есть"""
+    low, high = channel_ids(config)
+    params = {
+        "first": FIRST_CHANNEL_ID,
+        "channels": config.channels,
+        "posts": config.posts,
+        "logs": config.logs,
+        "pending_every": max(round(1 / config.pending_share), 1) if config.pending_share else 0,
+        "now": datetime.now(),
+        "offset": PENDING_OFFSET,
+    }
+    async with db_manager.unit_of_work() as session:
+        seeded = await session.scalar(
+            text("SELECT count(*) FROM channels WHERE id BETWEEN :low AND :high"),
+            {"low": low, "high": high},
+        )
+        if seeded:
+            return False
+        await session.execute(
+            insert(User)
+            .values(id=BENCHMARK_USER_ID, username="benchmark", role=UserRole.ADMIN)
+            .on_conflict_do_nothing()
+        )
+        # Каждый десятый канал неактивен
+        await session.execute(
+            text(
+                """
+                INSERT INTO channels (id, name, is_active, moderation_enabled, comment_chat_id)
+                SELECT CAST(:first AS bigint) - n, 'Plan channel ' || n, n % 10 <> 0, true, CAST(:first AS bigint) - n
+                FROM generate_series(0, :channels - 1) AS n
+                """
+            ),
+            params,
+        )
+        # Опубликованные и отменённые посты в прошлом, ожидающие - после PENDING_OFFSET
+        await session.execute(
+            text(
+                """
+                INSERT INTO posts (channel_id, title, text, publish_time, published, status, created_by, attempts)
+                SELECT s.channel_id, 'Plan post ' || s.n, 'Plan text ' || s.n, s.publish_time,
+                       CASE WHEN s.status = 'PUBLISHED' THEN s.publish_time END,
+                       s.status::poststatus, :user_id, 0
+                FROM (
+                    SELECT n, CAST(:first AS bigint) - n % :channels AS channel_id,
+                           CASE WHEN :pending_every > 0 AND n % :pending_every = 0 THEN 'PENDING'
+                                WHEN n % 50 = 1 THEN 'CANCELLED'
+                                ELSE 'PUBLISHED' END AS status,
+                           CASE WHEN :pending_every > 0 AND n % :pending_every = 0
+                                THEN CAST(:now AS timestamp) + CAST(:offset AS interval) + n * interval '30 seconds'
+                                ELSE CAST(:now AS timestamp) - n * interval '30 seconds' END AS publish_time
+                    FROM generate_series(1, :posts) AS n
+                ) AS s
+                """
+            ),
+            {**params, "user_id": BENCHMARK_USER_ID},
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO logs (user_id, action, channel_id, timestamp)
+                SELECT :user_id, 'plan_benchmark', CAST(:first AS bigint) - n % :channels,
+                       CAST(:now AS timestamp) - n * interval '1 second'
+                FROM generate_series(1, :logs) AS n
+                """
+            ),
+            {**params, "user_id": BENCHMARK_USER_ID},
+        )
+        # По строке статистики на опубликованный пост
+        await session.execute(
+            text(
+                """
+                INSERT INTO stats (channel_id, post_id, views, comments)
+                SELECT channel_id, id, (random() * 1000)::int, (random() * 50)::int
+                FROM posts
+                WHERE channel_id BETWEEN :low AND :high AND status = 'PUBLISHED'
+                """
+            ),
+            {"low": low, "high": high},
+        )
+    # Без свежей статистики планировщик считает таблицы пустыми
+    async with db_manager.unit_of_work() as session:
+        for table in ("channels", "posts", "logs", "stats"):
+            await session.execute(text(f"ANALYZE {table}"))
+    logger.info(f"Seeded {config.channels} channels, {config.posts} posts and {config.logs} logs")
+    return True
+
+
+async def cleanup(db_manager: DatabaseManager, config: PlanBenchmarkConfig):
+    low, high = channel_ids(config)
+    bounds = {"low": low, "high": high}
+    async with db_manager.unit_of_work() as session:
+        for table in ("stats", "logs", "posts", "channels"):
+            column = "id" if table == "channels" else "channel_id"
+            await session.execute(
+                text(f"DELETE FROM {table} WHERE {column} BETWEEN :low AND :high"), bounds
+            )
+
+
+def _summarize(plan: dict) -> str:
+    """Цепочка узлов плана, например «Limit > Index Scan (ix_posts_status_publish_time)»"""
+    nodes = []
+
+    def walk(node: dict):
+        name = node["Node Type"]
+        if index := node.get("Index Name"):
+            name += f" ({index})"
+        elif relation := node.get("Relation Name"):
+            name += f" ({relation})"
+        nodes.append(name)
+        for child in node.get("Plans", ()):
+            walk(child)
+
+    walk(plan)
+    return " > ".join(nodes)
+
+
+def _literal(value) -> str:
+    """Аргумент EXECUTE; тип задаёт PREPARE, поэтому достаточно строки"""
+    if isinstance(value, (bool, int)):
+        return str(value).lower()
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+async def _explain(
+    session: AsyncSession, name: str, sql: str, params: list, repeat: int
+) -> tuple[float, int, str]:
+    """Лучшее время выполнения, прочитанные страницы и план запроса.
+
+    asyncpg кэширует подготовленные запросы, и после пяти выполнений Postgres
+    переходит на общий план, не знающий значений параметров. Он и снимается:
+    PREPARE + EXPLAIN EXECUTE под plan_cache_mode = force_generic_plan.
+    """
+    types = ", ".join(PARAM_TYPES[param] for param, _ in params)
+    arguments = ", ".join(_literal(value) for _, value in params)
+    await session.execute(text(f"PREPARE {name} ({types}) AS {sql}"))
+    best = None
+    for _ in range(repeat):
+        result = await session.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) EXECUTE {name} ({arguments})")
+        )
+        explain = result.scalar()
+        if isinstance(explain, str):
+            explain = json.loads(explain)
+        explain = explain[0]
+        plan = explain["Plan"]
+        run = (
+            explain["Execution Time"],
+            plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+            _summarize(plan),
+        )
+        if best is None or run[0] < best[0]:
+            best = run
+    # Подготовленный запрос живёт в соединении, а не в транзакции
+    await session.execute(text(f"DEALLOCATE {name}"))
+    return best
+
+
+async def _explain_all(session: AsyncSession, params: dict, repeat: int) -> dict[str, tuple]:
+    await session.execute(text("SET LOCAL plan_cache_mode = force_generic_plan"))
+    plans = {}
+    for name, (sql, query_params) in QUERIES.items():
+        bound = [
+            (param, params[param] if value is None else value)
+            for param, value in query_params
+        ]
+        plans[name] = await _explain(session, name, sql, bound, repeat)
+    return plans
+
+
+async def run_plan_benchmark(
+    db_manager: DatabaseManager, config: PlanBenchmarkConfig
+) -> list[QueryPlan]:
+    """Сравнивает планы горячих запросов без индексов миграции и с ними.
+
+    «До» снимается в транзакции, которая удаляет индексы и откатывается,
+    поэтому оба замера идут на одних и тех же данных. DROP INDEX держит
+    эксклюзивную блокировку таблиц до отката - запускать на отдельной базе.
+    """
+    low, high = channel_ids(config)
+    async with db_manager.session_factory() as session:
+        post_id, first_pending = (
+            await session.execute(
+                text(
+                    "SELECT max(id) FILTER (WHERE status = 'PUBLISHED'), "
+                    "min(publish_time) FILTER (WHERE status = 'PENDING') "
+                    "FROM posts WHERE channel_id BETWEEN :low AND :high"
+                ),
+                {"low": low, "high": high},
+            )
+        ).one()
+    params = {
+        # Сутки созревших постов, как после простоя диспетчера
+        "now": (first_pending or datetime.now()) + timedelta(days=1),
+        "channel_id": high,
+        "post_id": post_id,
+    }
+    async with db_manager.session_factory() as session:
+        for index in HOT_PATH_INDEXES:
+            await session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        before = await _explain_all(session, params, config.repeat)
+        await session.rollback()
+    async with db_manager.session_factory() as session:
+        after = await _explain_all(session, params, config.repeat)
+        # FOR UPDATE в claim_due_posts держит блокировки до конца транзакции
+        await session.rollback()
+    return [
+        QueryPlan(
+            query=name,
+            before_ms=round(before[name][0], 3),
+            after_ms=round(after[name][0], 3),
+            before_buffers=before[name][1],
+            after_buffers=after[name][1],
+            before_plan=before[name][2],
+            after_plan=after[name][2],
+        )
+        for name in QUERIES
+    ]
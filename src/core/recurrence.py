@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from apscheduler.triggers.cron import CronTrigger
+from tzlocal import get_localzone
+
+from src.core.models import RecurringRule
+
+
+def validate_rule(cron: str | None, interval: int | None):
+    """Проверяет, что у правила задано ровно одно корректное расписание"""
+    if (cron is None) == (interval is None):
+        raise ValueError("Rule needs either a cron expression or an interval")
+    if interval is not None and interval <= 0:
+        raise ValueError("Interval must be positive")
+    if cron is not None:
+        CronTrigger.from_crontab(cron)
+
+
+def next_occurrence(rule: RecurringRule, after: datetime) -> datetime | None:
+    """Ближайшее срабатывание правила строго позже after, None - правило исчерпано.
+
+    Время наивное локальное, как publish_time у постов.
+    """
+    if rule.interval:
+        if after < rule.start_at:
+            moment = rule.start_at
+        else:
+            steps = int((after - rule.start_at).total_seconds() // rule.interval) + 1
+            moment = rule.start_at + timedelta(seconds=steps * rule.interval)
+    else:
+        zone = get_localzone()
+        trigger = CronTrigger.from_crontab(rule.cron, timezone=zone)
+        # Cron срабатывает не чаще раза в минуту, секунды достаточно для "строго позже"
+        earliest = max(after + timedelta(seconds=1), rule.start_at)
+        fire = trigger.get_next_fire_time(None, earliest.replace(tzinfo=zone))
+        if fire is None:
+            return None
+        moment = fire.astimezone(zone).replace(tzinfo=None)
+    if rule.end_at is not None and moment > rule.end_at:
+        return None
+    return moment
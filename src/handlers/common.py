@@ -27,8 +27,6 @@ async def cmd_start(message: types.Message, db_session: AsyncSession):
             role=UserRole.USER,
         )
         db_session.add(user)
-        await db_session.commit()
-        await db_session.close()
     await message.answer(f"Welcome, {user.id=} {user.username=}!")
 
 
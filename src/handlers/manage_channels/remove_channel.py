@@ -2,7 +2,7 @@ from aiogram import Router, F, types
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.crud import delete_channel
+from src.core.crud import delete_channel, get_channel_by_id
 from src.handlers.utils import (
     Buttons,
     Admin,
@@ -43,15 +43,10 @@ async def remove_channel_stage_2(message: types.Message, state: FSMContext, db_s
             await message.delete()
             await main_message.message.edit_text("❌Введите корректный ID канала:")
             return
-    channels = data.get("channels")
-    channel=None
-    filtered_channels = []
-    for c in channels:
-        if c.id == channel_id:
-            channel = c
-        else:
-            filtered_channels.append(c)
-    await state.update_data(channels=filtered_channels)
+    channel = await get_channel_by_id(db_session, channel_id)
+    if channel is None:
+        await main_message.message.edit_text("❌Канал не найден, введите другой ID:")
+        return
     await delete_channel(db_session, channel)
     await main_message.message.edit_text(
         text="Канал успешно удален!", reply_markup=go_to_main_menu_keyboard()
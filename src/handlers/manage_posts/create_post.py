@@ -4,18 +4,18 @@ from aiogram import Router, F, types, Bot
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, CallbackQuery
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from apscheduler.triggers.date import DateTrigger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.crud import get_active_channels, add_post, get_channel_by_id
-from src.handlers.manage_posts.shedule import scheduler
+from src.core.crud import add_post, get_channel_by_id
+from src.handlers.manage_posts.shedule import publish_dispatcher
 from src.handlers.mock import Post, PostStatus
 from src.handlers.utils import (
     Buttons,
     goto_main_menu_btn,
     Admin,
-    publish_post,
     go_to_main_menu_keyboard,
+    show_channels_page,
+    turn_page,
 )
 
 router = Router(name="create_post")
@@ -26,95 +26,18 @@ router = Router(name="create_post")
     Admin.manage_posts,
 )
 async def create_post_stage_1(callback: CallbackQuery,state: FSMContext, db_session: AsyncSession):
-    data = await state.get_data()
-    # Получаем каналы
-    channels = await get_active_channels(db_session)
-
-    main_message = data.get("main_message")
-    if not channels:
-        await main_message.message.edit_text(
-            text="❌ Каналы не найдены.",
-            reply_markup=go_to_main_menu_keyboard()
-        )
-        return
-    # Создаем клавиатуру с каналами`
-    page_size = 5
-    page = 0
-    total_pages = len(channels) // page_size
-    message_text = f"📢 Выберите канал для публикации: ({total_pages}):\n\n"
-    builder = InlineKeyboardBuilder()
-    for channel in channels[page : page + page_size]:
-        callback_data = f"channel_{channel.id}"
-        builder.button(
-            text=f"{channel.name} {channel.id}",
-            callback_data=callback_data,
-        )
-    data["page"] = page + page_size
-    data["channels"] = channels
-    await state.set_data(data)
-    if page + page_size < len(channels):
-        builder.button(
-            text=Buttons.forward_text, callback_data=Buttons.forward_callback
-        )
-    builder.button(**goto_main_menu_btn)
-    builder.adjust(1)
     await state.set_state(Admin.manage_posts)
-    await main_message.message.edit_text(
-        text=message_text,
-        reply_markup=builder.as_markup(),
-    )
+    await show_channels_page(state, db_session, [None])
 
 
 @router.callback_query(
     F.data.contains(Buttons.back_callback) | F.data.contains(Buttons.forward_callback),
     Admin.manage_posts,
 )
-async def change_page(callback_query: types.CallbackQuery, state: FSMContext):
-    page_size = 5
+async def change_page(callback_query: types.CallbackQuery, state: FSMContext, db_session: AsyncSession):
     data = await state.get_data()
-    main_message = data.get("main_message")
-    channels = data.get("channels")
-    page = data.get("page")
-    total_pages = len(channels) // page_size
-    if callback_query.data == Buttons.back_callback:
-        page -= page_size
-    if callback_query.data == Buttons.forward_callback:
-        page += page_size
-    await state.update_data(page=page)
-    builder = InlineKeyboardBuilder()
-
-    for channel in channels[page : page + page_size]:
-        callback_data = f"channel_{channel.id}"
-        builder.button(
-            text=f"{channel.name} {channel.id}",
-            callback_data=callback_data,
-        )
-    builder.adjust(1)
-
-    back = (
-        InlineKeyboardButton(
-            text=Buttons.back_text, callback_data=Buttons.back_callback
-        )
-        if page != 0
-        else None
-    )
-    forward = (
-        InlineKeyboardButton(
-            text=Buttons.forward_text, callback_data=Buttons.forward_callback
-        )
-        if page + page_size < len(channels)
-        else None
-    )
-    navigation = [back, forward]
-
-    builder.row(*[x for x in navigation if x])
-    builder.button(**goto_main_menu_btn)
-    message_text = f"📢 Выберите канал для публикации: ({total_pages}):\n\n"
-
-    await main_message.message.edit_text(
-        text=message_text,
-        reply_markup=builder.as_markup(),
-    )
+    cursors = turn_page(data.get("cursors"), data.get("next_cursor"), callback_query.data)
+    await show_channels_page(state, db_session, cursors)
 
 
 @router.callback_query(F.data.startswith("channel_"), Admin.manage_posts)
@@ -252,14 +175,9 @@ async def set_time(
         status=PostStatus.PENDING,
     )
     post = await add_post(db_session, post)
-
-    scheduler.add_job(
-        publish_post,
-        trigger=DateTrigger(run_date=publish_time),
-        args=[post.id],
-        id=f"post_{post.id}",
-        replace_existing=True,
-    )
+    # Коммит до подсказки диспетчеру, иначе он не увидит новый пост
+    await db_session.commit()
+    publish_dispatcher.schedule(post.id, publish_time)
     await main_message.message.edit_text(
         text=f"Пост запланирован на {publish_time.strftime('%Y-%m-%d %H:%M')}.",
         reply_markup=go_to_main_menu_keyboard(),
@@ -0,0 +1,78 @@
+import io
+
+from aiogram import Router, F, types, Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+from loguru import logger
+
+from src.handlers.manage_posts.shedule import publish_dispatcher
+from src.handlers.utils import (
+    Buttons,
+    goto_main_menu_btn,
+    Admin,
+)
+from src.publisher.bulk_import import detect_format, import_posts, read_rows
+
+router = Router(name="import_posts")
+
+# Сколько ошибочных строк показывать в отчёте
+REPORT_ERRORS = 20
+
+
+@router.callback_query(F.data == Buttons.import_posts_callback, Admin.manage_posts)
+async def import_posts_stage_1(callback_query: types.CallbackQuery, state: FSMContext):
+    data = await state.get_data()
+    main_message = data.get("main_message")
+    await state.set_state(Admin.import_posts)
+    builder = InlineKeyboardBuilder()
+    builder.button(**goto_main_menu_btn)
+    await main_message.message.edit_text(
+        text=(
+            "📥 Отправьте файл .csv или .jsonl с постами.\n\n"
+            "Колонки: <code>channel_id, title, text, publish_time</code>, "
+            "необязательные <code>photos, videos, document</code> "
+            "(несколько file_id в CSV через |)."
+        ),
+        reply_markup=builder.as_markup(),
+    )
+
+
+@router.message(Admin.import_posts, F.document)
+async def import_posts_stage_2(message: types.Message, state: FSMContext, bot: Bot, db_manager):
+    data = await state.get_data()
+    main_message = data.get("main_message")
+    builder = InlineKeyboardBuilder()
+    builder.button(**goto_main_menu_btn)
+    document = message.document
+    await message.delete()
+    buffer = io.BytesIO()
+    await bot.download(document, destination=buffer)
+    buffer.seek(0)
+    stream = io.TextIOWrapper(buffer, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_posts(
+            db_manager,
+            read_rows(stream, detect_format(document.file_name or "")),
+            created_by=message.from_user.id,
+        )
+    except Exception as e:
+        logger.error(f"Bulk import of {document.file_name} failed: {e}")
+        await main_message.message.edit_text(
+            text="❌ Не удалось импортировать файл, проверьте его формат.",
+            reply_markup=builder.as_markup(),
+        )
+        return
+    # Все новые сроки публикации регистрируются одной пачкой
+    publish_dispatcher.schedule_many(report.scheduled)
+    lines = [f"✅ Импортировано постов: {report.imported}"]
+    if report.errors:
+        lines.append(f"⚠️ Пропущено строк: {len(report.errors)}")
+        lines += [
+            f"Строка {line}: <code>{error}</code>"
+            for line, error in report.errors[:REPORT_ERRORS]
+        ]
+    await state.set_state(Admin.manage_posts)
+    await main_message.message.edit_text(
+        text="\n".join(lines),
+        reply_markup=builder.as_markup(),
+    )
@@ -1,20 +1,33 @@
-from aiogram import Router, F, types
+from aiogram import Router, F, types, Dispatcher
 from aiogram.fsm.context import FSMContext
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.crud import retry_dead_letters
 from src.handlers.manage_posts.create_post import router as create_post
+from src.handlers.manage_posts.import_posts import router as import_posts
 from src.handlers.manage_posts.list_posts import router as list_posts
 from src.handlers.manage_posts.remove_post import router as remove_post
-from src.handlers.manage_posts.shedule import scheduler
+from src.handlers.manage_posts.shedule import (
+    scheduler,
+    publish_dispatcher,
+    jobstore,
+    leader,
+    notification_digest,
+    recurring_expander,
+    global_storage,
+)
 from src.handlers.manage_posts.view_post import router as view_post
 from src.handlers.utils import (
     Buttons,
     goto_main_menu_btn,
     Admin,
+    publish_post,
 )
 
 router = Router(name="posts_main")
 router.include_router(create_post)
+router.include_router(import_posts)
 router.include_router(list_posts)
 router.include_router(remove_post)
 router.include_router(view_post)
@@ -27,6 +40,9 @@ async def manage_posts(callback_query: types.CallbackQuery, state: FSMContext):
     builder.button(
         text=Buttons.create_post_text, callback_data=Buttons.create_post_callback
     )
+    builder.button(
+        text=Buttons.import_posts_text, callback_data=Buttons.import_posts_callback
+    )
     builder.button(
         text=Buttons.remove_post_text, callback_data=Buttons.remove_post_callback
     )
@@ -34,6 +50,9 @@ async def manage_posts(callback_query: types.CallbackQuery, state: FSMContext):
         text=Buttons.list_posts_types_text,
         callback_data=Buttons.list_posts_types_callback,
     )
+    builder.button(
+        text=Buttons.retry_failed_text, callback_data=Buttons.retry_failed_callback
+    )
     builder.button(**goto_main_menu_btn)
     builder.adjust(1)
     await state.set_state(Admin.manage_posts)
@@ -43,22 +62,59 @@ async def manage_posts(callback_query: types.CallbackQuery, state: FSMContext):
     )
 
 
-# from src.core.crud import get_pending_posts
-# Запуск планировщика при старте бота
-# posts = await get_pending_posts(db_session)
-# for post in posts:
-#     scheduler.add_job(
-#         publish_post,
-#         trigger=DateTrigger(run_date=post.publish_time),
-#         args=[bot, post],
-#         id=f"post_{post.id}",
-#     )
-@router.startup()
-async def on_startup():
+@router.callback_query(F.data == Buttons.retry_failed_callback, Admin.manage_posts)
+async def retry_failed_posts(
+    callback_query: types.CallbackQuery, state: FSMContext, db_session: AsyncSession
+):
+    data = await state.get_data()
+    main_message = data.get("main_message")
+    builder = InlineKeyboardBuilder()
+    builder.button(**goto_main_menu_btn)
+    retried = await retry_dead_letters(db_session)
+    # Коммит до подсказки диспетчеру, иначе он не увидит возвращённые посты
+    await db_session.commit()
+    # Просроченные посты уйдут сразу, остальные - в своё время
+    publish_dispatcher.schedule_many(retried)
+    text = (
+        f"🔁 Возвращено в очередь постов: {len(retried)}"
+        if retried
+        else "✅ Неудачных публикаций нет."
+    )
+    await main_message.message.edit_text(text=text, reply_markup=builder.as_markup())
+
+
+# Запуск планировщика, когда реплика становится ведущей: диспетчер
+# восстанавливает расписание ожидающих постов и применяет политику к просроченным
+async def start_publishing(db_manager):
+    await jobstore.attach(db_manager)
     scheduler.start()
+    await publish_dispatcher.start(db_manager, publish_post)
+    await recurring_expander.start(db_manager, publish_dispatcher.schedule)
+
+
+async def stop_publishing():
+    await recurring_expander.stop()
+    await publish_dispatcher.stop()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    await jobstore.close()
+
+
+# Ведомые реплики обслуживают только админ-панель и ждут замка
+@router.startup()
+async def on_startup(dispatcher: Dispatcher):
+    db_manager = dispatcher.workflow_data["db_manager"]
+    # «Опубликовать сейчас» работает на любой реплике, и уведомления тоже
+    notification_digest.start(global_storage["bot"])
+    await leader.start(
+        db_manager.engine,
+        on_elected=lambda: start_publishing(db_manager),
+        on_demoted=stop_publishing,
+    )
 
 
 # Остановка планировщика при завершении
 @router.shutdown()
 async def on_shutdown():
-    scheduler.shutdown()
+    await leader.stop()
+    await notification_digest.close()
@@ -20,6 +20,7 @@ from src.handlers.utils import (
     Admin,
 )
 from src.core.crud import delete_post,get_post_by_id
+from src.handlers.manage_posts.shedule import publish_dispatcher
 
 router = Router(name="remove_post")
 
@@ -73,6 +74,7 @@ async def remove_post_stage_2(message: types.Message, state: FSMContext, db_sess
         )
         return
     await delete_post(db_session,post)
+    publish_dispatcher.cancel(post_id)
     await main_message.message.edit_text(
         text=f"✅ Пост [{post_id}] удален.",
         reply_markup=builder.as_markup(),
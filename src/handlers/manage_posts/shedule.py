@@ -1,8 +1,119 @@
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MISSED
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+
+from src.config import settings
+from src.publisher.dispatcher import PublishDispatcher
+from src.publisher.jobstore import AsyncPostgresJobStore
+from src.publisher.leader import LeaderElector
+from src.publisher.metrics import SCHEDULER_EVENTS
+from src.publisher.notifications import NotificationDigest
+from src.publisher.recurring import RecurringExpander
+from src.publisher.rehydration import CatchUpPolicy
+from src.publisher.staging import PayloadStager
+from src.utils.metrics import registry
+
+jobstore = AsyncPostgresJobStore()
 jobstores = {
-    'default': SQLAlchemyJobStore(url='sqlite:///jobs.sqlite')
+    'default': jobstore
 }
 scheduler = AsyncIOScheduler(jobstores=jobstores)
 
-global_storage={}
\ No newline at end of file
+payload_stager = PayloadStager(
+    lead=settings.publisher.stage_ahead,
+    max_size=settings.publisher.stage_max_size,
+)
+
+publish_dispatcher = PublishDispatcher(
+    batch_size=settings.publisher.batch_size,
+    workers=settings.publisher.workers,
+    poll_interval=settings.publisher.poll_interval,
+    tick=settings.publisher.tick,
+    catchup_policy=CatchUpPolicy(settings.publisher.catchup_policy),
+    catchup_grace=settings.publisher.catchup_grace,
+    catchup_burst=settings.publisher.catchup_burst,
+    catchup_window=settings.publisher.catchup_window,
+    stager=payload_stager,
+)
+
+# Уведомления о публикациях уходят сводками, а не по одному на пост
+notification_digest = NotificationDigest(
+    window=settings.publisher.digest_window,
+    max_events=settings.publisher.digest_max_events,
+)
+
+# Посты повторяющихся правил создаются к моменту подготовки публикации
+recurring_expander = RecurringExpander(
+    poll_interval=settings.publisher.recurring_poll_interval,
+    ahead=settings.publisher.stage_ahead,
+)
+
+# Расписанием и публикацией занимается только ведущая реплика
+leader = LeaderElector(
+    lock_id=settings.leader.lock_id,
+    retry_interval=settings.leader.retry_interval,
+    check_interval=settings.leader.check_interval,
+)
+
+
+def _on_job_event(event):
+    SCHEDULER_EVENTS.inc(event="error" if event.code == EVENT_JOB_ERROR else "missed")
+
+
+scheduler.add_listener(_on_job_event, EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+
+# Состояние планировщика снимается в момент запроса /metrics
+registry.gauge(
+    "autopost_publish_queue_depth",
+    "Claimed posts waiting for a publish worker",
+    collect=lambda: publish_dispatcher.queue_depth,
+)
+registry.gauge(
+    "autopost_publish_in_flight",
+    "Posts being published right now",
+    collect=lambda: publish_dispatcher.in_flight,
+)
+registry.gauge(
+    "autopost_publish_scheduled",
+    "Posts tracked by the dispatcher timing wheel",
+    collect=lambda: publish_dispatcher.scheduled,
+)
+registry.gauge(
+    "autopost_publish_staged",
+    "Pre-rendered payloads waiting for their publish_time",
+    collect=lambda: len(payload_stager),
+)
+registry.gauge(
+    "autopost_scheduler_jobs",
+    "Jobs in the APScheduler job store",
+    collect=lambda: len(scheduler.get_jobs()) if scheduler.running else 0,
+)
+registry.gauge(
+    "autopost_leader",
+    "1 if this replica owns scheduling and publishing",
+    collect=lambda: int(leader.is_leader),
+)
+
+
+def _lane_stat(field: str) -> dict[tuple[str], float] | None:
+    """Значение поля снимка приоритетных полос сессии бота по каждой полосе"""
+    bot = global_storage.get("bot")
+    lanes = getattr(bot.session, "lanes", None) if bot else None
+    if lanes is None:
+        return None
+    return {(lane,): stats[field] for lane, stats in lanes.snapshot().items()}
+
+
+registry.gauge(
+    "autopost_api_lane_queue_depth",
+    "Bot API requests waiting for a slot in their priority lane",
+    labels=("lane",),
+    collect=lambda: _lane_stat("queue_depth"),
+)
+registry.gauge(
+    "autopost_api_lane_in_flight",
+    "Bot API requests being sent right now per priority lane",
+    labels=("lane",),
+    collect=lambda: _lane_stat("in_flight"),
+)
+
+global_storage={}
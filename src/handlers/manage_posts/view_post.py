@@ -1,20 +1,24 @@
 # from src.core.models import Channel, Post, PostStatus, UserRole, User
 from datetime import datetime
+from html import escape
 
 import pendulum
 from aiogram import Router, F, types, Bot
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InputMediaPhoto, InputMediaVideo
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.crud import (
     get_post_by_id,
     update_post,
-    get_active_channels,
+    get_active_channel_ids,
     get_channel_by_id,
+    set_post_targets,
 )
 from core.models import PostStatus, Post
+from src.handlers.manage_posts.shedule import publish_dispatcher, payload_stager
 from src.handlers.utils import (
     Buttons,
     goto_main_menu_btn,
@@ -23,7 +27,10 @@ from src.handlers.utils import (
     get_post_details_keyboard,
     publish_post,
     yes_no_keyboard,
+    show_channels_page,
+    turn_page,
 )
+from src.publisher.retry import PublishError
 
 router = Router(name="edit_post")
 
@@ -144,7 +151,11 @@ async def edit_post_time_stage_2(message: types.Message, state: FSMContext,db_se
         )
         return
     post.publish_time = publish_time
+    post.retry_at = None  # новое время отменяет отложенный выход догоняния
     post=await update_post(db_session,post)
+    # Коммит до подсказки диспетчеру, иначе он может захватить пост со старым временем
+    await db_session.commit()
+    publish_dispatcher.schedule(post.id, publish_time)
     await state.update_data(post=post)
     details = get_post_details_text(post)
     builder = get_post_details_keyboard(post)
@@ -222,6 +233,7 @@ async def cancel_post(callback_query: types.CallbackQuery, state: FSMContext,db_
     post = data.get("post")
     post.status = PostStatus.CANCELLED
     post=await update_post(db_session,post)
+    publish_dispatcher.cancel(post.id)
     await state.update_data(post=post)
     details = get_post_details_text(post)
     builder = get_post_details_keyboard(post)
@@ -256,10 +268,22 @@ async def publish_now_stage_2(
     builder = InlineKeyboardBuilder()
     builder.button(**goto_main_menu_btn)
     if callback_query.data == Buttons.yes_sure_callback:
-        await publish_post(post.id)
+        # Подготовленная публикация сверяется с updated_at только при захвате
+        # диспетчером; здесь пост мог быть только что изменён, читаем заново
+        payload_stager.discard(post.id)
         await state.set_state(Admin.manage_posts_details)
+        try:
+            published = await publish_post(post.id)
+        except PublishError as e:
+            logger.error(f"Manual publish of post ID:{post.id} failed: {e}")
+            await main_message.message.edit_text(
+                f"❌ Не удалось опубликовать пост: {escape(str(e))}",
+                reply_markup=builder.as_markup(),
+            )
+            return
         await main_message.message.edit_text(
-            "Пост опубликован!", reply_markup=builder.as_markup()
+            "Пост опубликован!" if published else "❌ Пост уже опубликован, отменён или не может быть опубликован.",
+            reply_markup=builder.as_markup(),
         )
     else:
         details = get_post_details_text(post)
@@ -277,85 +301,18 @@ async def publish_now_stage_2(
 )
 
 async def edit_post_channel_list(callback_query: types.CallbackQuery, state: FSMContext,db_session: AsyncSession):
-    page_size = 5
-    page = 0
-
-    data = await state.get_data()
-    main_message = data.get("main_message")
-    channels = await get_active_channels(db_session)
-
-    builder = InlineKeyboardBuilder()
-    for channel in channels[:page_size]:
-        builder.button(
-            text=f"{channel.name} [{channel.id}]",
-            callback_data=f"channel_{channel.id}",
-        )
-
-    await state.update_data(page=page, channels=channels)
     await state.set_state(Admin.edit_post_channel)
-    if len(channels) > page_size:
-        builder.button(
-            text=Buttons.forward_text, callback_data=Buttons.forward_callback
-        )
-    builder.button(**goto_main_menu_btn)
-    builder.adjust(1)
-
-    message_text = f"📢 Выберите канал для публикации ({page=}):\n\n"
-    await main_message.message.edit_text(
-        text=message_text,
-        reply_markup=builder.as_markup(),
-    )
+    await show_channels_page(state, db_session, [None])
 
 
 @router.callback_query(
     F.data.contains(Buttons.back_callback) | F.data.contains(Buttons.forward_callback),
     Admin.edit_post_channel,
 )
-async def edit_post_channel_change_page(callback_query: types.CallbackQuery, state: FSMContext):
-    page_size = 5
+async def edit_post_channel_change_page(callback_query: types.CallbackQuery, state: FSMContext, db_session: AsyncSession):
     data = await state.get_data()
-    main_message = data.get("main_message")
-    channels = data.get("channels")
-    page = data.get("page")
-    total_pages = len(channels) // page_size
-    if callback_query.data == Buttons.back_callback:
-        page -= 1
-    if callback_query.data == Buttons.forward_callback:
-        page += 1
-    builder = InlineKeyboardBuilder()
-    p = channels[page * page_size : page * page_size + page_size]
-    n = channels[page * page_size : page * page_size + page_size + 1]
-    for channel in p:
-        builder.button(
-            text=f"{channel.name} [{channel.id}]",
-            callback_data=f"channel_{channel.id}",
-        )
-    builder.adjust(1)
-
-    back = (
-        InlineKeyboardButton(
-            text=Buttons.back_text, callback_data=Buttons.back_callback
-        )
-        if page != 0
-        else None
-    )
-    forward = (
-        InlineKeyboardButton(
-            text=Buttons.forward_text, callback_data=Buttons.forward_callback
-        )
-        if len(n) > len(p)
-        else None
-    )
-    navigation = [back, forward]
-    builder.row(*[x for x in navigation if x])
-    builder.button(**goto_main_menu_btn)
-    await state.update_data(page=page, channels=channels)
-
-    message_text = f"📢 Выберите канал для публикации ({page=}):\n\n"
-    await main_message.message.edit_text(
-        text=message_text,
-        reply_markup=builder.as_markup(),
-    )
+    cursors = turn_page(data.get("cursors"), data.get("next_cursor"), callback_query.data)
+    await show_channels_page(state, db_session, cursors)
 
 
 @router.callback_query(F.data.startswith("channel_"), Admin.edit_post_channel)
@@ -375,6 +332,56 @@ async def edit_post_channel_chosen(callback_query: types.CallbackQuery, state: F
         reply_markup=builder.as_markup(),
     )
 
+@router.callback_query(F.data == Buttons.edit_targets_callback, Admin.manage_posts_details)
+async def edit_post_targets_stage_1(
+    callback_query: types.CallbackQuery, state: FSMContext
+):
+    data = await state.get_data()
+    main_message = data.get("main_message")
+    await state.set_state(Admin.edit_post_targets)
+    await main_message.message.edit_text(
+        "Введите ID каналов для кросспостинга через пробел или запятую "
+        "(0 - публиковать только в основной канал):"
+    )
+
+
+@router.message(Admin.edit_post_targets)
+async def edit_post_targets_stage_2(message: types.Message, state: FSMContext, db_session: AsyncSession):
+    data = await state.get_data()
+    main_message = data.get("main_message")
+    post: Post = data.get("post")
+    try:
+        channel_ids = [
+            int(x) for x in message.text.replace(",", " ").split() if int(x) != 0
+        ]
+        await message.delete()
+    except ValueError:
+        await message.delete()
+        await main_message.message.edit_text(
+            "❌ID каналов должны быть числами. Введите ID через пробел или запятую:"
+        )
+        return
+    active_ids = await get_active_channel_ids(db_session, channel_ids)
+    unknown = [channel_id for channel_id in channel_ids if channel_id not in active_ids]
+    if unknown:
+        await main_message.message.edit_text(
+            f"❌Активные каналы не найдены: {', '.join(map(str, unknown))}\n"
+            "Введите ID каналов через пробел или запятую:"
+        )
+        return
+    # Основной канал поста всегда входит в кросспостинг
+    targets = [post.channel_id, *channel_ids] if channel_ids else []
+    await set_post_targets(db_session, post.id, targets)
+    post = await get_post_by_id(db_session, post.id)
+    await state.update_data(post=post)
+    details = get_post_details_text(post)
+    builder = get_post_details_keyboard(post)
+    await state.set_state(Admin.manage_posts_details)
+    await main_message.message.edit_text(
+        text=details,
+        reply_markup=builder.as_markup(),
+    )
+
 # async def send_media_with_captions(bot: Bot, chat_id: int):
 #     media = [
 #         InputMediaPhoto(
@@ -1,17 +1,44 @@
 from datetime import datetime
+from html import escape
 from typing import Optional
 
 from aiogram import types
-from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.types import InlineKeyboardButton, InputMediaPhoto, InputMediaVideo
+from aiogram.types import InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.crud import update_post, get_post_by_id, get_channel_by_id
-from src.core.models import User, UserRole, Log, Post, PostStatus, Channel
-from src.handlers.manage_posts.shedule import global_storage
+from src.config import settings
+from src.core.crud import (
+    get_channels_page,
+    get_post_targets,
+    get_posts_for_publish,
+    mark_post_published,
+    save_target_results,
+)
+from src.core.models import (
+    User,
+    UserRole,
+    Log,
+    Post,
+    PostStatus,
+    Channel,
+    OutboxStatus,
+    PublishOutbox,
+    TargetStatus,
+)
+from src.core.pagination import Page
+from src.handlers.manage_posts.shedule import (
+    global_storage,
+    notification_digest,
+    payload_stager,
+)
+from src.publisher.metrics import PUBLISH_LAG, PUBLISH_RESULTS
+from src.publisher.outbox import deliver
+from src.publisher.retry import PublishError
+from src.publisher.staging import PublishPayload
 
 
 class Buttons:
@@ -64,6 +91,10 @@ class Buttons:
     list_posts_types_callback = "#list_posts_types#"
     cancel_post_text = "Отменить пост"
     cancel_post_callback = "#cancel_post#"
+    import_posts_text = "Импорт постов из файла"
+    import_posts_callback = "#import_posts#"
+    retry_failed_text = "Повторить неудачные публикации"
+    retry_failed_callback = "#retry_failed#"
 
     pending_posts_text = "Ожидающие публикации"
     pending_posts_callback = "#pending_posts#"
@@ -89,6 +120,8 @@ class Buttons:
     edit_remove_media_callback = "#remove_media#"
     edit_channel_text = "Изменить канал публикации"
     edit_channel_callback = "#edit_channel#"
+    edit_targets_text = "Каналы кросспостинга"
+    edit_targets_callback = "#edit_targets#"
 
     forward_text = "Вперед"
     forward_callback = "#forward#"
@@ -135,6 +168,73 @@ def yes_no_keyboard():
     return builder.as_markup()
 
 
+def turn_page(cursors: list[str | None], next_cursor: str | None, callback_data: str) -> list[str | None]:
+    """Стек курсоров открытых страниц, последний - курсор текущей.
+
+    Назад по keyset-курсору не пройти, поэтому курсоры пройденных страниц
+    хранятся в состоянии, а не сами списки.
+    """
+    if callback_data == Buttons.forward_callback and next_cursor:
+        return [*cursors, next_cursor]
+    if callback_data == Buttons.back_callback and len(cursors) > 1:
+        return cursors[:-1]
+    return cursors
+
+
+def add_page_navigation(builder: InlineKeyboardBuilder, cursors: list[str | None], page: Page):
+    navigation = []
+    if len(cursors) > 1:
+        navigation.append(
+            InlineKeyboardButton(text=Buttons.back_text, callback_data=Buttons.back_callback)
+        )
+    if page.has_next:
+        navigation.append(
+            InlineKeyboardButton(text=Buttons.forward_text, callback_data=Buttons.forward_callback)
+        )
+    if navigation:
+        builder.row(*navigation)
+
+
+async def show_channels_page(
+    state: FSMContext,
+    db_session: AsyncSession,
+    cursors: list[str | None],
+    is_active: bool | None = True,
+    header: str = "📢 Выберите канал для публикации",
+):
+    """Страница списка каналов с кнопками channel_{id}.
+
+    Фильтр сохраняется в состоянии (channels_active), чтобы обработчик
+    листания запрашивал тот же список.
+    """
+    page_size = 5
+    data = await state.get_data()
+    main_message = data.get("main_message")
+    page = await get_channels_page(db_session, is_active, cursors[-1], page_size)
+    if not page.items:
+        await main_message.message.edit_text(
+            text="❌ Каналы не найдены.",
+            reply_markup=go_to_main_menu_keyboard()
+        )
+        return
+
+    builder = InlineKeyboardBuilder()
+    for channel in page.items:
+        builder.button(
+            text=f"{channel.name} [{channel.id}]",
+            callback_data=f"channel_{channel.id}",
+        )
+    builder.adjust(1)
+    add_page_navigation(builder, cursors, page)
+    builder.row(InlineKeyboardButton(**goto_main_menu_btn))
+    await state.update_data(channels_active=is_active, cursors=cursors, next_cursor=page.next_cursor)
+
+    await main_message.message.edit_text(
+        text=f"{header} (page={len(cursors) - 1}):\n\n",
+        reply_markup=builder.as_markup(),
+    )
+
+
 class Admin(StatesGroup):
     main = State()
     manage_channels = State()
@@ -164,9 +264,11 @@ class Admin(StatesGroup):
     edit_post_media = State()
     edit_post_title = State()
     edit_post_channel = State()
+    edit_post_targets = State()
     publish_now = State()
 
     remove_post = State()
+    import_posts = State()
 
 
 async def check_admin_access(
@@ -204,7 +306,6 @@ async def log_action(
         timestamp=datetime.now(),
     )
     db_session.add(log)
-    await db_session.commit()
 
 
 def get_channel_details_text(channel):
@@ -263,6 +364,7 @@ def get_post_details_text(post):
 
     status_emoji = {
         "pending": "⏳",
+        "publishing": "🚀",
         "scheduled": "📅",
         "published": "✅",
         "failed": "❌",
@@ -271,6 +373,7 @@ def get_post_details_text(post):
 
     status_text = {
         "pending": "ОЖИДАЕТ",
+        "publishing": "ПУБЛИКУЕТСЯ",
         "scheduled": "ЗАПЛАНИРОВАН",
         "published": "ОПУБЛИКОВАН",
         "failed": "ОШИБКА",
@@ -353,6 +456,9 @@ def get_post_details_keyboard(post):
     builder.button(
         text=Buttons.edit_channel_text, callback_data=Buttons.edit_channel_callback
     )
+    builder.button(
+        text=Buttons.edit_targets_text, callback_data=Buttons.edit_targets_callback
+    )
     builder.button(
         text=Buttons.edit_time_text, callback_data=Buttons.edit_time_callback
     )
@@ -402,43 +508,114 @@ def get_post_preview_text(post):
     )
 
 
-async def publish_post(post_id: int) -> None:
+async def publish_to_targets(
+    bot, db_session: AsyncSession, payload: PublishPayload
+) -> tuple[dict[int, PublishOutbox], dict[int, Exception | None], int]:
+    """Кросспостинг: параллельно публикует пост во все ещё не опубликованные каналы.
+
+    Возвращает записи outbox по каналам, каналы, в которые опубликовать
+    не удалось, с ошибкой отправки и число каналов, получивших пост в этом вызове.
+    """
+    entries, sent, errors = await deliver(
+        db_session,
+        payload.post_id,
+        list(payload.targets),
+        lambda chat_id, sent: payload.send(bot, chat_id, sent),
+        lease=settings.publisher.outbox_lease,
+        concurrency=settings.publisher.fanout_workers,
+    )
+    rows, failed = [], {}
+    for chat_id in payload.targets:
+        entry = entries.get(chat_id)
+        if entry is None or entry.status != OutboxStatus.SENT:
+            # Ошибки нет, если запись сейчас отправляет другой обработчик
+            failed[chat_id] = errors.get(chat_id)
+            rows.append(
+                {
+                    "channel_id": chat_id,
+                    "status": TargetStatus.FAILED,
+                    "error": entry.error if entry else None,
+                }
+            )
+        else:
+            rows.append(
+                {
+                    "channel_id": chat_id,
+                    "status": TargetStatus.PUBLISHED,
+                    "message_ids": entry.message_ids,
+                    "published": entry.sent_at,
+                }
+            )
+    await save_target_results(db_session, payload.post_id, rows)
+    # Итоги по каналам нужны и тогда, когда публикация целиком упадёт
+    await db_session.commit()
+    return entries, failed, sent
+
+
+async def publish_post(post_id: int) -> bool:
+    """Публикует пост; False - пост уже не публикуется (отменён, опубликован и т.п.).
+
+    Неудачная отправка выбрасывает PublishError.
+    """
     bot = global_storage["bot"]
     db_manager = global_storage["db_manager"]
-    session_generator = db_manager.get_async_session()
-    async for session in session_generator:
-        db_session = session
-        post: Post = await get_post_by_id(db_session, post_id)
-        channel: Channel = await get_channel_by_id(db_session, post.channel_id)
-        if post.document:
-            await bot.send_document(
-                chat_id=post.channel_id, document=post.document, caption=post.text
+    # Фазы outbox коммитятся внутри deliver, отметка о публикации - в конце
+    async with db_manager.unit_of_work() as db_session:
+        # Обычно публикация подготовлена заранее, иначе читаем пост сейчас
+        payload = payload_stager.pop(post_id)
+        if payload is None:
+            rows = await get_posts_for_publish(db_session, [post_id])
+            if not rows:
+                logger.warning(f"Post ID:{post_id} is not publishable, skipping")
+                PUBLISH_RESULTS.inc(result="skipped")
+                return False
+            payload = PublishPayload.from_row(rows[0])
+        if payload.cross_posted:
+            entries, failed, sent = await publish_to_targets(bot, db_session, payload)
+            if failed:
+                # Опубликованные цели сохранены, при повторе уйдут только упавшие
+                raise PublishError(
+                    f"Post ID:{post_id} failed in {len(failed)} of {len(payload.targets)} channels",
+                    [error for error in failed.values() if error is not None],
+                )
+            # В payload только неопубликованные цели: при повторе основной
+            # канал обычно уже получил пост, его сообщения берём из целей
+            targets = await get_post_targets(db_session, post_id)
+            message_ids = next(
+                (target.message_ids for target in targets if target.channel_id == payload.channel_id),
+                None,
+            )
+            published_in = f"{len(targets)} каналах"
+            logger.info(
+                f"Post ID:{post_id} is cross-posted to {len(targets)} channels"
             )
-        elif post.photos or post.videos:
-            media = []
-            for photo in post.photos:
-                media.append(InputMediaPhoto(media=photo))
-            for video in post.videos:
-                media.append(InputMediaVideo(media=video))
-            media[0].caption = post.text
-            msg = await bot.send_media_group(chat_id=post.channel_id, media=media)
         else:
-            msg = await bot.send_message(chat_id=post.channel_id, text=post.text)
-        logger.info(
-            f"Post ID:{post.id} is published in channel {channel.name}[{post.channel_id}]"
-        )
-        if channel.notification_chat_id:
-            try:
-                await bot.send_message(
-                    chat_id=channel.notification_chat_id,
-                    text=f"Пост <b>{post.title}</b> опубликован в канале <b>{channel.name}[{post.channel_id}]</b>",
-                    parse_mode="HTML",
-                )
-            except TelegramBadRequest:
-                logger.error(
-                    "Невозможно отправить уведомление о публикации поста, проверьте настройки канала."
+            entries, sent, errors = await deliver(
+                db_session,
+                post_id,
+                [payload.channel_id],
+                lambda chat_id, sent: payload.send(bot, chat_id, sent),
+                lease=settings.publisher.outbox_lease,
+            )
+            entry = entries.get(payload.channel_id)
+            if entry is None or entry.status != OutboxStatus.SENT:
+                raise PublishError(
+                    f"Post ID:{post_id} is not delivered to [{payload.channel_id}]: "
+                    f"{entry.error if entry else 'no outbox entry'}",
+                    list(errors.values()),
                 )
-        post.message_id = msg.message_id
-        post.published = datetime.now()
-        post.status = PostStatus.PUBLISHED
-        await update_post(db_session, post)
+            message_ids = entry.message_ids
+            published_in = f"канале <b>{escape(payload.channel_name)}[{payload.channel_id}]</b>"
+            logger.info(
+                f"Post ID:{post_id} is published in channel {payload.channel_name}[{payload.channel_id}]"
+            )
+        lag = (datetime.now() - payload.publish_time).total_seconds()
+        # «Опубликовать сейчас» до срока - не задержка, в гистограмму не идёт
+        if lag >= 0:
+            PUBLISH_LAG.observe(lag)
+        PUBLISH_RESULTS.inc(result="published")
+        # Если всё ушло до падения бота, повторно не уведомляем
+        if sent and payload.notification_chat_id:
+            notification_digest.add(payload.notification_chat_id, payload.title, published_in)
+        await mark_post_published(db_session, post_id, message_ids)
+    return True
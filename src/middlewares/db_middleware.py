@@ -1,7 +1,54 @@
 from aiogram import BaseMiddleware
 from aiogram.types import Update
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from typing import Callable, Dict, Any, Awaitable
 from src.handlers.manage_posts.shedule import global_storage
+from src.utils.metrics import registry
+
+# Апдейты по тому, понадобилась ли им база: навигация по меню обходится без неё
+DB_UPDATES = registry.counter(
+    "autopost_updates_db_total",
+    "Processed updates by database usage",
+    labels=("db",),
+)
+
+
+class LazySession:
+    """Сессия, которая создаётся при первом обращении к ней.
+
+    Подставляется хендлерам вместо AsyncSession: все атрибуты проксируются
+    в настоящую сессию, а апдейты, которые базу не трогали, не создают ни
+    сессии, ни транзакции.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+        self._session: AsyncSession | None = None
+        # Бралось ли соединение из пула, в том числе до явного коммита в хендлере
+        self.touched = False
+
+    def _on_begin(self, session, transaction, connection):
+        self.touched = True
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._session_factory()
+            event.listen(self._session.sync_session, "after_begin", self._on_begin)
+        return getattr(self._session, name)
+
+    async def finish(self, error: BaseException | None = None):
+        """Коммитит единицу работы апдейта или откатывает её при ошибке"""
+        if self._session is None:
+            return
+        try:
+            if error is None:
+                await self._session.commit()
+            else:
+                await self._session.rollback()
+        finally:
+            await self._session.close()
+
 
 class DatabaseMiddleware(BaseMiddleware):
     async def __call__(
@@ -13,10 +60,16 @@ class DatabaseMiddleware(BaseMiddleware):
 
         db_manager = data["dispatcher"].workflow_data["db_manager"]
         global_storage['db_manager'] = db_manager
-        session_generator = db_manager.get_async_session()
-        async for session in session_generator:
-            data["db_session"] = session
-            try:
-                return await handler(event, data)
-            finally:
-                await session.close()
+        # Все запросы апдейта идут одной транзакцией и коммитятся после хендлера;
+        # соединение берётся из пула только при первом запросе
+        session = LazySession(db_manager.session_factory)
+        data["db_session"] = session
+        try:
+            result = await handler(event, data)
+        except BaseException as e:
+            DB_UPDATES.inc(db="used" if session.touched else "unused")
+            await session.finish(e)
+            raise
+        DB_UPDATES.inc(db="used" if session.touched else "unused")
+        await session.finish()
+        return result
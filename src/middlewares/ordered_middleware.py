@@ -0,0 +1,58 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Router
+from aiogram.dispatcher.event.bases import UNHANDLED, SkipHandler
+from aiogram.types import ErrorEvent, Update
+
+from src.utils.update_executor import OrderedUpdateExecutor
+
+
+class OrderedUpdateMiddleware(BaseMiddleware):
+    """Передаёт обработку апдейта в OrderedUpdateExecutor и сразу возвращается.
+
+    Ключ - чат и пользователь апдейта, как у FSM. Должен стоять первым из
+    своих outer-middleware, чтобы сессия БД открывалась уже в очереди ключа.
+    Встроенный ErrorsMiddleware диспетчера к этому моменту уже вернулся,
+    поэтому ошибки обработчиков передаются в наблюдатель error здесь.
+    """
+
+    def __init__(self, executor: OrderedUpdateExecutor, router: Router):
+        """
+        :param executor: Очереди апдейтов по ключам
+        :param router: Корневой роутер (диспетчер), чьи error-хендлеры получают ошибки
+        """
+        self.executor = executor
+        self.router = router
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        key = (chat.id if chat else None, user.id if user else None)
+
+        async def process():
+            # Состояние FSM прочитано при приёме апдейта; к моменту обработки
+            # его мог сменить предыдущий апдейт того же ключа
+            if state := data.get("state"):
+                data["raw_state"] = await state.get_state()
+            try:
+                return await handler(event, data)
+            except SkipHandler:
+                raise
+            except Exception as e:
+                response = await self.router.propagate_event(
+                    update_type="error",
+                    event=ErrorEvent(update=event, exception=e),
+                    **data,
+                )
+                if response is not UNHANDLED:
+                    return response
+                # Необработанную ошибку логирует OrderedUpdateExecutor
+                raise
+
+        await self.executor.submit(key, process)
+        return UNHANDLED
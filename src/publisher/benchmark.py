@@ -0,0 +1,245 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from aiogram import Bot
+from aiogram.client.telegram import TelegramAPIServer
+from loguru import logger
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.database import DatabaseManager
+from src.core.models import Channel, Post, PostStatus, PostTarget, User, UserRole
+from src.handlers.manage_posts.shedule import global_storage, payload_stager
+from src.handlers.utils import publish_post
+from src.publisher.dispatcher import PublishDispatcher
+from src.utils.fake_bot_api import FakeBotAPI
+from src.utils.rate_limiter import TelegramRateLimiter
+from src.utils.smart_session import SmartAiohttpSession
+
+# Диапазон ID каналов бенчмарка, как у сидера /write, но не пересекается с ним
+FIRST_CHANNEL_ID = -1009000000000
+BENCHMARK_USER_ID = 1
+# Запросы, не относящиеся к публикации
+SERVICE_METHODS = ("getMe", "getUpdates", "deleteWebhook")
+
+
+@dataclass
+class BenchmarkConfig:
+    channels: int = 10
+    posts: int = 1000
+    # Каналов кросспостинга на пост, 0 - публикация только в свой канал
+    targets: int = 0
+    # Фото на пост: больше 10 уходит несколькими медиагруппами
+    photos: int = 0
+    # Первый пост созревает через start_in секунд, последний - ещё через spread
+    start_in: float = 5.0
+    spread: float = 0.0
+    workers: int = 8
+    batch_size: int = 100
+    tick: float = 1.0
+    # Подготавливать публикации заранее или читать пост в момент публикации
+    stage: bool = True
+    # Проактивный лимитер сессии; без него лимиты соблюдаются только по 429
+    rate_limit: bool = True
+    timeout: float = 600.0
+
+
+@dataclass
+class BenchmarkReport:
+    published: int
+    failed: int
+    duration: float
+    posts_per_sec: float
+    lag_p50: float
+    lag_p99: float
+    db_queries_per_publish: float
+    api_calls_per_publish: float
+    responses_429: int
+    responses_5xx: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+async def seed(db_manager: DatabaseManager, config: BenchmarkConfig) -> datetime:
+    """Создаёт каналы и посты бенчмарка, возвращает publish_time первого поста"""
+    channel_ids = [FIRST_CHANNEL_ID - n for n in range(config.channels)]
+    first = datetime.now() + timedelta(seconds=config.start_in)
+    step = config.spread / max(config.posts - 1, 1)
+    photos = [f"bench-photo-{n}" for n in range(config.photos)] or None
+    async with db_manager.session_factory() as session:
+        await session.execute(
+            insert(User)
+            .values(id=BENCHMARK_USER_ID, username="benchmark", role=UserRole.ADMIN)
+            .on_conflict_do_nothing()
+        )
+        await session.execute(
+            insert(Channel),
+            [
+                {
+                    "id": channel_id,
+                    "name": f"Benchmark channel {n}",
+                    "comment_chat_id": channel_id,
+                    "notification_chat_id": None,
+                }
+                for n, channel_id in enumerate(channel_ids)
+            ],
+        )
+        for start in range(0, config.posts, 5000):
+            rows = [
+                {
+                    "channel_id": channel_ids[n % len(channel_ids)],
+                    "created_by": BENCHMARK_USER_ID,
+                    "title": f"Benchmark post {n}",
+                    "text": f"Benchmark text {n}",
+                    "photos": photos,
+                    "publish_time": first + timedelta(seconds=step * n),
+                }
+                for n in range(start, min(start + 5000, config.posts))
+            ]
+            post_ids = (
+                await session.scalars(insert(Post).returning(Post.id), rows)
+            ).all()
+            if config.targets:
+                await session.execute(
+                    insert(PostTarget),
+                    [
+                        {
+                            "post_id": post_id,
+                            "channel_id": channel_ids[(n + k) % len(channel_ids)],
+                        }
+                        for n, post_id in enumerate(post_ids, start=start)
+                        for k in range(min(config.targets, len(channel_ids)))
+                    ],
+                )
+        await session.commit()
+    logger.info(f"Seeded {config.channels} channels and {config.posts} posts")
+    return first
+
+
+async def cleanup(db_manager: DatabaseManager, config: BenchmarkConfig):
+    channel_ids = [FIRST_CHANNEL_ID - n for n in range(config.channels)]
+    async with db_manager.session_factory() as session:
+        # outbox, цели и dead letters удаляются каскадом
+        await session.execute(delete(Post).where(Post.channel_id.in_(channel_ids)))
+        await session.execute(delete(Channel).where(Channel.id.in_(channel_ids)))
+        await session.commit()
+
+
+async def foreign_pending_posts(db_manager: DatabaseManager, config: BenchmarkConfig) -> int:
+    """Посты не из бенчмарка, которые диспетчер тоже бы опубликовал"""
+    channel_ids = [FIRST_CHANNEL_ID - n for n in range(config.channels)]
+    async with db_manager.session_factory() as session:
+        return await session.scalar(
+            select(func.count(Post.id)).where(
+                Post.status.in_([PostStatus.PENDING, PostStatus.PUBLISHING]),
+                Post.channel_id.not_in(channel_ids),
+            )
+        )
+
+
+async def _progress(db_manager: DatabaseManager, config: BenchmarkConfig) -> tuple[int, int]:
+    channel_ids = [FIRST_CHANNEL_ID - n for n in range(config.channels)]
+    async with db_manager.session_factory() as session:
+        rows = await session.execute(
+            select(Post.status, func.count(Post.id))
+            .where(Post.channel_id.in_(channel_ids))
+            .group_by(Post.status)
+        )
+        counts = dict(rows.all())
+    return counts.get(PostStatus.PUBLISHED, 0), counts.get(PostStatus.FAILED, 0)
+
+
+async def _lag_stats(db_manager: DatabaseManager, config: BenchmarkConfig) -> tuple[float, float, float]:
+    """p50 и p99 задержки публикации и время от первого срока до последней публикации"""
+    channel_ids = [FIRST_CHANNEL_ID - n for n in range(config.channels)]
+    lag = func.extract("epoch", Post.published - Post.publish_time)
+    async with db_manager.session_factory() as session:
+        row = (
+            await session.execute(
+                select(
+                    func.percentile_cont(0.5).within_group(lag),
+                    func.percentile_cont(0.99).within_group(lag),
+                    func.extract("epoch", func.max(Post.published) - func.min(Post.publish_time)),
+                ).where(
+                    Post.channel_id.in_(channel_ids),
+                    Post.status == PostStatus.PUBLISHED,
+                )
+            )
+        ).one()
+    return tuple(float(value or 0.0) for value in row)
+
+
+async def run_benchmark(
+    db_manager: DatabaseManager,
+    monitor: DatabaseManager,
+    server: FakeBotAPI,
+    config: BenchmarkConfig,
+) -> BenchmarkReport:
+    """Прогоняет весь путь публикации против фейкового Bot API.
+
+    Посты сидируются в базу, диспетчер находит их сам, как после рестарта.
+    Запросы считаются на движке db_manager, через который публикует диспетчер;
+    прогресс опрашивается отдельным движком monitor, чтобы не искажать счёт.
+    """
+    rate_limiter = None
+    if not config.rate_limit:
+        rate_limiter = TelegramRateLimiter(global_rate=1e9, group_rate=1e9, private_rate=1e9)
+    bot = Bot(
+        token="123456:BENCHMARK",
+        session=SmartAiohttpSession(
+            api=TelegramAPIServer.from_base(server.url), rate_limiter=rate_limiter
+        ),
+    )
+    global_storage["bot"] = bot
+    global_storage["db_manager"] = db_manager
+    dispatcher = PublishDispatcher(
+        batch_size=config.batch_size,
+        workers=config.workers,
+        tick=config.tick,
+        stager=payload_stager if config.stage else None,
+    )
+    queries = 0
+
+    def count_query(*args):
+        nonlocal queries
+        queries += 1
+
+    await seed(monitor, config)
+    server.reset_stats()
+    event.listen(db_manager.engine.sync_engine, "before_cursor_execute", count_query)
+    started = time.monotonic()
+    try:
+        await dispatcher.start(db_manager, publish_post)
+        published = failed = 0
+        while published + failed < config.posts:
+            if time.monotonic() - started > config.timeout:
+                logger.warning(f"Benchmark timed out after {config.timeout}s")
+                break
+            await asyncio.sleep(0.5)
+            published, failed = await _progress(monitor, config)
+    finally:
+        await dispatcher.stop()
+        event.remove(db_manager.engine.sync_engine, "before_cursor_execute", count_query)
+        await bot.session.close()
+    duration = time.monotonic() - started
+    lag_p50, lag_p99, span = await _lag_stats(monitor, config)
+    api_calls = sum(
+        count
+        for key, count in server.stats.items()
+        if key.startswith("requests.") and key.removeprefix("requests.") not in SERVICE_METHODS
+    )
+    return BenchmarkReport(
+        published=published,
+        failed=failed,
+        duration=round(duration, 3),
+        posts_per_sec=round(published / span, 2) if span else 0.0,
+        lag_p50=round(lag_p50, 3),
+        lag_p99=round(lag_p99, 3),
+        db_queries_per_publish=round(queries / published, 2) if published else 0.0,
+        api_calls_per_publish=round(api_calls / published, 2) if published else 0.0,
+        responses_429=server.stats["429"],
+        responses_5xx=server.stats["5xx"],
+    )
@@ -0,0 +1,175 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from loguru import logger
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy import select, text
+
+from src.core.database import DatabaseManager
+from src.core.models import Channel
+
+# Колонки временной таблицы в порядке записей COPY
+IMPORT_COLUMNS = ("line", "channel_id", "title", "text", "photos", "videos", "document", "publish_time")
+
+
+class ImportedPost(BaseModel):
+    """Строка импорта: CSV-колонки или ключи JSONL с теми же именами"""
+
+    channel_id: int
+    title: str
+    text: str
+    publish_time: datetime
+    photos: list[str] | None = None
+    videos: list[str] | None = None
+    # Ограничение колонки posts.document (String(255)), иначе COPY уронит весь импорт
+    document: str | None = Field(default=None, max_length=255)
+
+    @field_validator("title", "text")
+    @classmethod
+    def not_blank(cls, value: str) -> str:
+        if not value.strip():
+            raise ValueError("must not be empty")
+        return value
+
+    @field_validator("photos", "videos", mode="before")
+    @classmethod
+    def split_media(cls, value):
+        # В CSV несколько file_id перечисляются через |
+        if isinstance(value, str):
+            return [item.strip() for item in value.split("|") if item.strip()] or None
+        return value
+
+    @field_validator("document", mode="before")
+    @classmethod
+    def empty_document(cls, value):
+        return value or None
+
+    @field_validator("publish_time")
+    @classmethod
+    def to_local(cls, value: datetime) -> datetime:
+        # publish_time хранится в наивном локальном времени
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    # (publish_time, post_id) новых постов для регистрации в диспетчере
+    scheduled: list[tuple[datetime, int]] = field(default_factory=list)
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[tuple[int, dict]]:
+    """Потоково читает файл импорта, отдаёт (номер строки, поля)"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_num, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield line_num, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_num, {"__error__": f"invalid JSON: {e.msg}"}
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def detect_format(filename: str) -> str:
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+async def import_posts(
+    db_manager: DatabaseManager,
+    rows: Iterable[tuple[int, dict]],
+    created_by: int,
+    chunk_size: int = 5000,
+    strict: bool = False,
+) -> ImportReport:
+    """Импортирует посты одной транзакцией.
+
+    Строки проверяются пачками по chunk_size и через COPY попадают во временную
+    таблицу, затем одним INSERT ... SELECT переносятся в posts. Память не
+    зависит от размера файла. Неверные строки попадают в отчёт и пропускаются;
+    со strict любая ошибка отменяет весь импорт.
+    """
+    report = ImportReport()
+    rows = iter(rows)
+    async with db_manager.session_factory() as session:
+        channels = set((await session.execute(select(Channel.id))).scalars().all())
+        await session.execute(
+            text(
+                "CREATE TEMP TABLE posts_import ("
+                "line integer, channel_id bigint, title text, text text, "
+                "photos varchar[], videos varchar[], document varchar(255), "
+                "publish_time timestamp"
+                ") ON COMMIT DROP"
+            )
+        )
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        driver = raw.driver_connection
+        while chunk := list(islice(rows, chunk_size)):
+            records = []
+            for line, fields in chunk:
+                if "__error__" in fields:
+                    report.errors.append((line, fields["__error__"]))
+                    continue
+                try:
+                    post = ImportedPost.model_validate(fields)
+                except ValidationError as e:
+                    report.errors.append((line, _describe(e)))
+                    continue
+                if post.channel_id not in channels:
+                    report.errors.append((line, f"unknown channel {post.channel_id}"))
+                    continue
+                records.append(
+                    (
+                        line,
+                        post.channel_id,
+                        post.title,
+                        post.text,
+                        post.photos,
+                        post.videos,
+                        post.document,
+                        post.publish_time,
+                    )
+                )
+            if report.errors and strict:
+                await session.rollback()
+                return report
+            if records:
+                await driver.copy_records_to_table(
+                    "posts_import", records=records, columns=IMPORT_COLUMNS
+                )
+        result = await session.execute(
+            text(
+                "INSERT INTO posts "
+                "(channel_id, title, text, photos, videos, document, publish_time, status, created_by) "
+                "SELECT channel_id, title, text, photos, videos, document, publish_time, "
+                "'PENDING', :created_by FROM posts_import ORDER BY line "
+                "RETURNING publish_time, id"
+            ),
+            {"created_by": created_by},
+        )
+        report.scheduled = [tuple(row) for row in result.all()]
+        report.imported = len(report.scheduled)
+        await session.commit()
+    logger.info(
+        f"Imported {report.imported} posts, {len(report.errors)} rows rejected"
+    )
+    return report
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
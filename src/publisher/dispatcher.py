@@ -0,0 +1,297 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from src.core.crud import (
+    claim_due_posts,
+    dead_letter_post,
+    get_next_publish_time,
+    release_posts,
+    schedule_post_retry,
+)
+from src.core.database import DatabaseManager
+from src.publisher.metrics import DISPATCHER_ERRORS, NEXT_DUE, PUBLISH_RESULTS
+from src.publisher.rehydration import CatchUpPolicy, rehydrate
+from src.publisher.retry import RetryQueue
+from src.publisher.staging import PayloadStager
+from src.publisher.timing_wheel import TimingWheel
+from src.utils.priority_lanes import Lane, api_lane
+
+PublishCallback = Callable[[int], Awaitable[object]]
+
+
+class PublishDispatcher:
+    """Диспетчер публикаций поверх таблицы posts.
+
+    Таблица posts - единственный источник истины: диспетчер пачками захватывает
+    созревшие посты (status=PENDING, publish_time <= now) и раздаёт их пулу
+    воркеров. Колесо таймеров нужно только для того, чтобы проснуться точно
+    к publish_time, а не ждать следующего опроса: все посты одного тика
+    захватываются одним запросом.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        workers: int = 8,
+        poll_interval: float = 5.0,
+        tick: float = 1.0,
+        catchup_policy: CatchUpPolicy = CatchUpPolicy.ALL,
+        catchup_grace: float = 60.0,
+        catchup_burst: int = 20,
+        catchup_window: float = 1800.0,
+        stager: PayloadStager | None = None,
+        retry_queue: RetryQueue | None = None,
+    ):
+        """
+        :param batch_size: Сколько постов захватывать за один запрос
+        :param workers: Количество параллельных воркеров публикации
+        :param poll_interval: Максимальная пауза между опросами таблицы (секунды)
+        :param tick: Точность колеса таймеров (секунды)
+        :param catchup_policy: Что делать с постами, просроченными за время простоя
+        :param catchup_grace: Опоздание (секунды), которое не считается просрочкой
+        :param catchup_burst: Лимит просроченных публикаций в секунду для политики ALL
+        :param catchup_window: Окно (секунды) для политики SPREAD
+        :param stager: Кэш публикаций, подготавливаемых заранее
+        :param retry_queue: Политики повторов упавших публикаций
+        """
+        self.batch_size = batch_size
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.catchup_policy = catchup_policy
+        self.catchup_grace = catchup_grace
+        self.catchup_burst = catchup_burst
+        self.catchup_window = catchup_window
+        self._db_manager: DatabaseManager | None = None
+        self._publish: PublishCallback | None = None
+        self._queue: asyncio.Queue[int] = asyncio.Queue(maxsize=batch_size * 2)
+        self._wheel = TimingWheel(tick=tick)
+        self._stager = stager
+        # Второе колесо срабатывает за stager.lead секунд до публикации
+        self._stage_wheel = TimingWheel(tick=tick)
+        self._staging: set[asyncio.Task] = set()
+        self._in_flight = 0
+        self._retry_queue = retry_queue or RetryQueue()
+        # Число прошлых неудачных попыток захваченных постов
+        self._attempts: dict[int, int] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        # Подсказки принимаются только пока диспетчер работает (реплика ведущая)
+        self._active = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def queue_depth(self) -> int:
+        """Захваченные посты, ждущие свободного воркера"""
+        return self._queue.qsize()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def start(self, db_manager: DatabaseManager, publish: PublishCallback):
+        if self._active:
+            return
+        self._db_manager = db_manager
+        self._publish = publish
+        self._active = True
+        # Посты, захваченные до падения бота, возвращаем в очередь
+        async with db_manager.unit_of_work() as session:
+            released = await release_posts(session)
+        if released:
+            logger.warning(f"Released {released} posts left in PUBLISHING state")
+        await rehydrate(
+            db_manager,
+            self,
+            policy=self.catchup_policy,
+            grace=self.catchup_grace,
+            burst=self.catchup_burst,
+            window=self.catchup_window,
+        )
+        self._tasks.append(
+            asyncio.create_task(self._claim_loop(), name="publish-dispatcher")
+        )
+        for n in range(self.workers):
+            self._tasks.append(
+                asyncio.create_task(self._worker(), name=f"publish-worker-{n}")
+            )
+        logger.info(
+            f"Publish dispatcher started: workers={self.workers}, batch={self.batch_size}"
+        )
+
+    async def stop(self):
+        if not self._active:
+            return
+        self._active = False
+        for task in self._tasks:
+            task.cancel()
+        for task in self._staging:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._staging, return_exceptions=True)
+        self._tasks.clear()
+        # Захваченные, но не отправленные посты возвращаем в очередь
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._release(pending)
+        self._attempts.clear()
+        # После повторного старта расписание заново читается из базы
+        self._wheel = TimingWheel(tick=self._wheel.tick)
+        self._stage_wheel = TimingWheel(tick=self._wheel.tick)
+        if self._stager:
+            self._stager.clear()
+        logger.info("Publish dispatcher stopped")
+
+    def schedule(self, post_id: int, publish_time: datetime):
+        """Подсказка диспетчеру о времени публикации нового или изменённого поста"""
+        if not self._active:
+            return
+        self._wheel.insert(post_id, publish_time)
+        if self._stager:
+            self._stager.discard(post_id)
+            self._stage_wheel.insert(post_id, self._stage_time(publish_time))
+        if publish_time <= datetime.now():
+            self._wakeup.set()
+
+    def schedule_many(self, entries: list[tuple[datetime, int]]):
+        """Массовая регистрация (publish_time, post_id), каждая вставка O(1)"""
+        if not self._active:
+            return
+        for publish_time, post_id in entries:
+            self._wheel.insert(post_id, publish_time)
+            if self._stager:
+                self._stage_wheel.insert(post_id, self._stage_time(publish_time))
+        if entries:
+            self._wakeup.set()
+
+    def cancel(self, post_id: int):
+        """Убирает пост из колеса, например после отмены или удаления"""
+        self._wheel.cancel(post_id)
+        self._stage_wheel.cancel(post_id)
+        if self._stager:
+            self._stager.discard(post_id)
+
+    def _stage_time(self, publish_time: datetime) -> datetime:
+        return publish_time - timedelta(seconds=self._stager.lead)
+
+    @property
+    def scheduled(self) -> int:
+        return len(self._wheel)
+
+    async def _claim_loop(self):
+        loop = asyncio.get_running_loop()
+        last_poll = 0.0
+        while True:
+            self._wakeup.clear()
+            self._stage(self._stage_wheel.advance())
+            due = self._wheel.advance()
+            if not due and loop.time() - last_poll < self.poll_interval:
+                # Ничего не созрело - ждём следующего тика колеса
+                await self._sleep(self._wheel.tick)
+                continue
+            # Страховочный опрос раз в poll_interval ловит посты, созданные
+            # в обход диспетчера, например другими репликами или импортом
+            last_poll = loop.time()
+            try:
+                async with self._db_manager.unit_of_work() as session:
+                    claimed = await claim_due_posts(
+                        session, datetime.now(), self.batch_size
+                    )
+                    next_due = await get_next_publish_time(session)
+                NEXT_DUE.set(next_due.timestamp() if next_due else float("nan"))
+            except Exception as e:
+                logger.error(f"Failed to claim due posts: {e}")
+                DISPATCHER_ERRORS.inc(stage="claim")
+                claimed = []
+            post_ids = []
+            for post_id, version, attempts in claimed:
+                self._attempts[post_id] = attempts
+                if self._stager:
+                    self._stager.validate(post_id, version)
+                post_ids.append(post_id)
+            if post_ids:
+                logger.debug(f"Claimed {len(post_ids)} due posts")
+            for post_id in post_ids:
+                # Ограниченная очередь даёт обратное давление на захват
+                await self._queue.put(post_id)
+            if len(post_ids) == self.batch_size:
+                # Очередь ещё не разобрана - сразу берём следующую пачку
+                last_poll = 0.0
+                continue
+            await self._sleep(self._wheel.tick)
+
+    def _stage(self, post_ids: list[int]):
+        """Готовит публикации в фоне, не задерживая захват созревших постов"""
+        if not post_ids or not self._stager:
+            return
+        task = asyncio.create_task(self._run_stage(post_ids))
+        self._staging.add(task)
+        task.add_done_callback(self._staging.discard)
+
+    async def _run_stage(self, post_ids: list[int]):
+        try:
+            await self._stager.stage(self._db_manager, post_ids)
+        except Exception as e:
+            logger.error(f"Failed to stage {len(post_ids)} posts: {e}")
+            DISPATCHER_ERRORS.inc(stage="stage")
+
+    async def _sleep(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self):
+        # Запросы воркера идут в полосе публикаций и не тормозят админ-панель
+        api_lane.set(Lane.PUBLISH)
+        while True:
+            post_id = await self._queue.get()
+            attempts = self._attempts.pop(post_id, 0)
+            self._in_flight += 1
+            try:
+                await self._publish(post_id)
+            except Exception as e:
+                logger.error(f"Failed to publish post ID:{post_id}: {e}")
+                PUBLISH_RESULTS.inc(result="failed")
+                await self._fail(post_id, attempts + 1, e)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _fail(self, post_id: int, attempt: int, error: Exception):
+        """Откладывает повтор или переносит пост в dead letters, воркер не ждёт"""
+        error_class, delay = self._retry_queue.next_delay(error, attempt)
+        try:
+            async with self._db_manager.unit_of_work() as session:
+                if delay is None:
+                    await dead_letter_post(session, post_id, attempt, error_class, str(error))
+                    PUBLISH_RESULTS.inc(result="dead_letter")
+                    logger.warning(
+                        f"Post ID:{post_id} moved to dead letters after {attempt} attempts ({error_class})"
+                    )
+                    return
+                retry_at = datetime.now() + timedelta(seconds=delay)
+                await schedule_post_retry(session, post_id, attempt, retry_at)
+            self.schedule(post_id, retry_at)
+            logger.info(
+                f"Post ID:{post_id} will be retried in {delay:.0f}s "
+                f"(attempt {attempt}, {error_class})"
+            )
+        except Exception as e:
+            logger.error(f"Failed to schedule retry of post ID:{post_id}: {e}")
+            DISPATCHER_ERRORS.inc(stage="retry")
+            await self._release([post_id])
+
+    async def _release(self, post_ids: list[int]):
+        try:
+            async with self._db_manager.unit_of_work() as session:
+                await release_posts(session, post_ids)
+        except Exception as e:
+            logger.error(f"Failed to release posts {post_ids}: {e}")
+            DISPATCHER_ERRORS.inc(stage="release")
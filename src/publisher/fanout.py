@@ -0,0 +1,28 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+async def fan_out(
+    send: Callable[[int], Awaitable[T]],
+    chat_ids: list[int],
+    concurrency: int = 10,
+) -> dict[int, T | Exception]:
+    """Параллельно выполняет send для каждого чата ограниченным пулом.
+
+    Ошибка одного чата не прерывает остальные: для каждого chat_id
+    возвращается либо результат, либо исключение. Лимиты Bot API
+    соблюдает сессия бота, пул лишь ограничивает число одновременных запросов.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(chat_id: int) -> T | Exception:
+        async with semaphore:
+            try:
+                return await send(chat_id)
+            except Exception as e:
+                return e
+
+    results = await asyncio.gather(*(run(chat_id) for chat_id in chat_ids))
+    return dict(zip(chat_ids, results))
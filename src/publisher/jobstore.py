@@ -0,0 +1,168 @@
+import asyncio
+import pickle
+
+from apscheduler.job import Job
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.util import datetime_to_utc_timestamp
+from loguru import logger
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.database import DatabaseManager
+from src.core.models import SchedulerJob
+
+
+class AsyncPostgresJobStore(MemoryJobStore):
+    """Хранилище задач APScheduler в Postgres поверх асинхронного движка.
+
+    Интерфейс хранилищ APScheduler синхронный, поэтому чтение идёт из памяти,
+    а изменения копятся и пачками записываются фоновой задачей через
+    DatabaseManager. Event loop не блокируется ни на чтении, ни на записи.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        flush_batch: int = 500,
+        pickle_protocol: int = pickle.HIGHEST_PROTOCOL,
+    ):
+        """
+        :param flush_interval: Максимальная задержка записи изменений (секунды)
+        :param flush_batch: После скольких изменений писать, не дожидаясь интервала
+        :param pickle_protocol: Протокол сериализации задач
+        """
+        super().__init__()
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.pickle_protocol = pickle_protocol
+        self._db_manager: DatabaseManager | None = None
+        # job_id -> задача для upsert или None для удаления
+        self._pending: dict[str, Job | None] = {}
+        self._clear_all = False
+        self._loaded: list[SchedulerJob] = []
+        self._flush_requested = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+
+    async def attach(self, db_manager: DatabaseManager):
+        """Загружает сохранённые задачи и запускает фоновую запись.
+
+        Вызывается до scheduler.start(): задачи восстанавливаются в start(),
+        когда хранилище уже знает свой планировщик.
+        """
+        self._db_manager = db_manager
+        # При повторном подключении (смена ведущей реплики) база важнее памяти
+        MemoryJobStore.remove_all_jobs(self)
+        self._pending.clear()
+        self._clear_all = False
+        async with db_manager.session_factory() as session:
+            result = await session.execute(
+                select(SchedulerJob).order_by(SchedulerJob.next_run_time)
+            )
+            self._loaded = list(result.scalars().all())
+        self._flush_task = asyncio.create_task(
+            self._flush_loop(), name="jobstore-flush"
+        )
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        for row in self._loaded:
+            try:
+                super().add_job(self._reconstitute_job(row.job_state))
+            except Exception as e:
+                logger.error(f"Unable to restore scheduler job {row.id}: {e}")
+                self._pending[row.id] = None
+        self._loaded = []
+
+    def _reconstitute_job(self, job_state: bytes) -> Job:
+        state = pickle.loads(job_state)
+        state["jobstore"] = self
+        job = Job.__new__(Job)
+        job.__setstate__(state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _mark(self, job_id: str, job: Job | None):
+        self._pending[job_id] = job
+        if len(self._pending) >= self.flush_batch:
+            self._flush_requested.set()
+
+    def add_job(self, job):
+        super().add_job(job)
+        self._mark(job.id, job)
+
+    def update_job(self, job):
+        super().update_job(job)
+        self._mark(job.id, job)
+
+    def remove_job(self, job_id):
+        super().remove_job(job_id)
+        self._mark(job_id, None)
+
+    def remove_all_jobs(self):
+        super().remove_all_jobs()
+        self._pending.clear()
+        self._clear_all = True
+        self._flush_requested.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Записывает накопленные изменения одной транзакцией"""
+        if not (self._pending or self._clear_all) or self._db_manager is None:
+            return
+        pending, self._pending = self._pending, {}
+        clear_all, self._clear_all = self._clear_all, False
+        upserts = [
+            {
+                "id": job.id,
+                "next_run_time": datetime_to_utc_timestamp(job.next_run_time),
+                "job_state": pickle.dumps(job.__getstate__(), self.pickle_protocol),
+            }
+            for job in pending.values()
+            if job is not None
+        ]
+        removed = [job_id for job_id, job in pending.items() if job is None]
+        try:
+            async with self._db_manager.session_factory() as session:
+                if clear_all:
+                    await session.execute(delete(SchedulerJob))
+                if removed:
+                    await session.execute(
+                        delete(SchedulerJob).where(SchedulerJob.id.in_(removed))
+                    )
+                if upserts:
+                    stmt = insert(SchedulerJob)
+                    await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[SchedulerJob.id],
+                            set_={
+                                "next_run_time": stmt.excluded.next_run_time,
+                                "job_state": stmt.excluded.job_state,
+                            },
+                        ),
+                        upserts,
+                    )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to persist {len(pending)} scheduler jobs: {e}")
+            # Возвращаем изменения, более свежие правки имеют приоритет
+            self._pending = {**pending, **self._pending}
+            self._clear_all = self._clear_all or clear_all
+
+    async def close(self):
+        """Останавливает фоновую запись и сбрасывает оставшиеся изменения"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+LeaderCallback = Callable[[], Awaitable[None]]
+
+
+class LeaderElector:
+    """Выбор ведущей реплики через сессионный advisory lock Postgres.
+
+    Замок держит отдельное соединение: пока оно живо, реплика ведущая.
+    Postgres снимает замок сам, когда соединение рвётся, поэтому ведомые,
+    опрашивающие замок раз в retry_interval, подхватывают работу за секунды.
+    Ведущая раз в check_interval проверяет соединение и при ошибке
+    немедленно слагает полномочия, чтобы не публиковать без замка.
+    """
+
+    def __init__(
+        self,
+        lock_id: int,
+        retry_interval: float = 2.0,
+        check_interval: float = 5.0,
+    ):
+        """
+        :param lock_id: Ключ advisory lock, общий для всех реплик
+        :param retry_interval: Как часто ведомая пытается взять замок (секунды)
+        :param check_interval: Как часто ведущая проверяет соединение (секунды)
+        """
+        self.lock_id = lock_id
+        self.retry_interval = retry_interval
+        self.check_interval = check_interval
+        self._engine: AsyncEngine | None = None
+        self._conn: AsyncConnection | None = None
+        self._on_elected: LeaderCallback | None = None
+        self._on_demoted: LeaderCallback | None = None
+        self._leader = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader
+
+    async def start(
+        self,
+        engine: AsyncEngine,
+        on_elected: LeaderCallback,
+        on_demoted: LeaderCallback,
+    ):
+        if self._task:
+            return
+        self._engine = engine
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._task = asyncio.create_task(self._run(), name="leader-election")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._demote()
+        if self._conn is not None:
+            try:
+                await self._conn.execute(select(func.pg_advisory_unlock(self.lock_id)))
+                await self._conn.commit()
+                await self._conn.close()
+            except Exception as e:
+                logger.error(f"Failed to release leader lock: {e}")
+                await self._drop_connection()
+            self._conn = None
+
+    async def _run(self):
+        while True:
+            try:
+                if self._conn is None:
+                    self._conn = await self._engine.connect()
+                if self._leader:
+                    await self._conn.execute(select(1))
+                    await self._conn.commit()
+                elif await self._try_lock():
+                    self._leader = True
+                    logger.info(f"This replica is now the leader (lock {self.lock_id})")
+                    await self._on_elected()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Leader election failed: {e}")
+                await self._demote()
+                await self._drop_connection()
+            await asyncio.sleep(
+                self.check_interval if self._leader else self.retry_interval
+            )
+
+    async def _try_lock(self) -> bool:
+        result = await self._conn.execute(
+            select(func.pg_try_advisory_lock(self.lock_id))
+        )
+        await self._conn.commit()
+        return bool(result.scalar())
+
+    async def _demote(self):
+        if not self._leader:
+            return
+        self._leader = False
+        logger.warning(f"This replica is no longer the leader (lock {self.lock_id})")
+        try:
+            await self._on_demoted()
+        except Exception as e:
+            logger.error(f"Failed to stop leader duties: {e}")
+
+    async def _drop_connection(self):
+        # Закрываем физическое соединение: в пуле замок остался бы взятым
+        if self._conn is None:
+            return
+        try:
+            await self._conn.invalidate()
+            await self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
@@ -0,0 +1,27 @@
+from src.utils.metrics import registry
+
+# Опоздание публикации относительно publish_time: от долей секунды до часа
+PUBLISH_LAG = registry.histogram(
+    "autopost_publish_lag_seconds",
+    "Delay between post publish_time and delivery to Telegram",
+    buckets=(0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900, 3600),
+)
+PUBLISH_RESULTS = registry.counter(
+    "autopost_publish_total",
+    "Publish attempts by result",
+    labels=("result",),
+)
+DISPATCHER_ERRORS = registry.counter(
+    "autopost_dispatcher_errors_total",
+    "Publish dispatcher failures by stage",
+    labels=("stage",),
+)
+SCHEDULER_EVENTS = registry.counter(
+    "autopost_scheduler_job_events_total",
+    "APScheduler job errors and misfires",
+    labels=("event",),
+)
+NEXT_DUE = registry.gauge(
+    "autopost_next_due_timestamp_seconds",
+    "Unix time of the earliest pending post",
+)
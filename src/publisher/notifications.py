@@ -0,0 +1,117 @@
+import asyncio
+from html import escape
+
+from aiogram.exceptions import TelegramBadRequest
+from loguru import logger
+
+from src.utils.priority_lanes import Lane, use_lane
+
+# Лимит длины текста сообщения Bot API
+MESSAGE_LIMIT = 4096
+# Заголовок в сводке обрезается до экранирования, чтобы не разрезать
+# HTML-сущность и чтобы строка сводки всегда помещалась в сообщение
+TITLE_LIMIT = 256
+
+
+def split_message(lines: list[str], limit: int = MESSAGE_LIMIT) -> list[str]:
+    """Собирает строки в сообщения не длиннее limit, не разрывая строки.
+
+    Строки не режутся: в них HTML-разметка, и разрез посередине тега сломал
+    бы всё сообщение. Длину строк ограничивает NotificationDigest.add.
+    """
+    messages: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in lines:
+        # +1 на перевод строки между строками
+        if current and size + 1 + len(line) > limit:
+            messages.append("\n".join(current))
+            current, size = [], 0
+        size += len(line) + (1 if current else 0)
+        current.append(line)
+    if current:
+        messages.append("\n".join(current))
+    return messages
+
+
+class NotificationDigest:
+    """Копит уведомления о публикациях по чатам и отправляет их сводкой.
+
+    Сводка уходит через window секунд после первого события чата или сразу,
+    как только набралось max_events событий. Во время волны публикаций
+    это одно сообщение вместо одного на каждый пост.
+    """
+
+    def __init__(self, window: float = 10.0, max_events: int = 30):
+        """
+        :param window: Сколько секунд копить события перед отправкой сводки
+        :param max_events: После скольких событий отправлять сводку, не дожидаясь окна
+        """
+        self.window = window
+        self.max_events = max_events
+        self._bot = None
+        self._events: dict[int, list[tuple[str, str]]] = {}
+        self._timers: dict[int, asyncio.Task] = {}
+        self._sending: set[asyncio.Task] = set()
+
+    def start(self, bot):
+        self._bot = bot
+
+    def add(self, chat_id: int, title: str, published_in: str):
+        """Добавляет событие публикации; published_in - уже готовый HTML"""
+        events = self._events.setdefault(chat_id, [])
+        if len(title) > TITLE_LIMIT:
+            title = title[: TITLE_LIMIT - 1] + "…"
+        events.append((escape(title), published_in))
+        if len(events) >= self.max_events:
+            self._spawn(self._flush(chat_id))
+        elif chat_id not in self._timers:
+            self._timers[chat_id] = asyncio.create_task(self._flush_later(chat_id))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _flush_later(self, chat_id: int):
+        await asyncio.sleep(self.window)
+        self._timers.pop(chat_id, None)
+        await self._flush(chat_id)
+
+    async def _flush(self, chat_id: int):
+        timer = self._timers.pop(chat_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        events = self._events.pop(chat_id, None)
+        if not events:
+            return
+        if len(events) == 1:
+            title, published_in = events[0]
+            lines = [f"Пост <b>{title}</b> опубликован в {published_in}"]
+        else:
+            lines = [f"📢 Опубликовано постов: {len(events)}"]
+            lines += [f"• <b>{title}</b> — {published_in}" for title, published_in in events]
+        for text in split_message(lines):
+            try:
+                with use_lane(Lane.BACKGROUND):
+                    await self._bot.send_message(
+                        chat_id=chat_id, text=text, parse_mode="HTML"
+                    )
+            except TelegramBadRequest as e:
+                # Остальные части сводки могут уйти, пропускаем только эту
+                logger.error(f"Publish digest part rejected by [{chat_id}], check the chat settings: {e}")
+                continue
+            except Exception as e:
+                logger.error(f"Failed to send publish digest part to [{chat_id}]: {e}")
+                continue
+
+    async def close(self):
+        """Отправляет всё накопленное, например при остановке бота"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        await asyncio.gather(
+            *(self._flush(chat_id) for chat_id in list(self._events)),
+            *self._sending,
+            return_exceptions=True,
+        )
@@ -0,0 +1,97 @@
+import os
+import socket
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.crud import (
+    claim_outbox_entries,
+    complete_outbox_entries,
+    enqueue_outbox,
+    get_outbox_entries,
+)
+from src.core.models import OutboxStatus, PublishOutbox
+from src.publisher.fanout import fan_out
+from src.publisher.retry import PartialSendError
+
+# Процесс-владелец захваченных записей outbox, для логов и отладки
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def deliver(
+    session: AsyncSession,
+    post_id: int,
+    chat_ids: list[int],
+    send: Callable[[int, list[int] | None], Awaitable[list[int]]],
+    lease: float = 600.0,
+    concurrency: int = 10,
+) -> tuple[dict[int, PublishOutbox], int, dict[int, Exception]]:
+    """Отправляет пост в чаты через outbox.
+
+    Фазы: запись (ключ post:chat), захват с арендой, отправка, фиксация
+    результата. Чат со статусом SENT повторно не получает пост, даже если бот
+    упал до отметки поста опубликованным. Остаётся одно неустранимое окно:
+    падение между ответом Telegram и фиксацией SENT - такая запись по истечении
+    аренды уйдёт повторно.
+
+    :param send: Отправляет пост в чат, продолжая с уже отправленных сообщений,
+        и возвращает ID всех сообщений
+    :param lease: Через сколько секунд чужой захват считается брошенным; должна
+        быть больше худшего времени отправки, включая ожидание лимитера
+    :return: Записи outbox по chat_ids, число чатов, отправленных в этом вызове,
+        и исключения отправки по чатам
+    """
+    # Каждая фаза коммитится сразу: захват и итог отправки должны быть видны
+    # другим обработчикам до и после запросов к Telegram
+    # Свой токен на каждый вызов: воркеры диспетчера и «Опубликовать сейчас»
+    # работают в одном процессе, и фиксация по истёкшей аренде не должна
+    # пройти за того, кто перезахватил запись
+    owner = f"{WORKER_ID}:{uuid4().hex}"
+    await enqueue_outbox(session, post_id, chat_ids)
+    await session.commit()
+    claimed = await claim_outbox_entries(session, post_id, chat_ids, owner, lease)
+    await session.commit()
+    entry_ids = {chat_id: entry_id for entry_id, chat_id, _ in claimed}
+    sent_ids = {chat_id: message_ids for _, chat_id, message_ids in claimed}
+    results = await fan_out(
+        lambda chat_id: send(chat_id, sent_ids[chat_id]),
+        list(entry_ids),
+        concurrency=concurrency,
+    )
+    rows, sent, errors = [], 0, {}
+    for chat_id, result in results.items():
+        if isinstance(result, Exception):
+            errors[chat_id] = result
+            logger.error(f"Post ID:{post_id} failed in chat [{chat_id}]: {result}")
+            rows.append(
+                {
+                    "id": entry_ids[chat_id],
+                    "status": OutboxStatus.FAILED,
+                    "error": str(result),
+                    # Ушедшая часть альбома при повторе не отправляется заново
+                    "message_ids": (
+                        result.message_ids
+                        if isinstance(result, PartialSendError)
+                        else sent_ids[chat_id]
+                    ),
+                }
+            )
+        else:
+            sent += 1
+            rows.append(
+                {
+                    "id": entry_ids[chat_id],
+                    "status": OutboxStatus.SENT,
+                    "message_ids": result,
+                }
+            )
+    await complete_outbox_entries(session, owner, rows)
+    await session.commit()
+    entries = {
+        entry.chat_id: entry
+        for entry in await get_outbox_entries(session, post_id)
+        if entry.chat_id in chat_ids
+    }
+    return entries, sent, errors
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.database import DatabaseManager
+from src.core.models import Post, PostStatus, RecurringRule
+from src.core.recurrence import next_occurrence
+
+MaterializedCallback = Callable[[int, datetime], None]
+
+
+class RecurringExpander:
+    """Создаёт посты из повторяющихся правил в момент срабатывания.
+
+    Будущие повторения не хранятся: у правила есть только next_run. Пост
+    создаётся, а next_run сдвигается в одной транзакции, строки правил
+    захватываются через SKIP LOCKED, поэтому повторение не удвоится.
+    Пропущенные за время простоя повторения схлопываются в один пост.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = 30.0,
+        ahead: float = 0.0,
+        batch_size: int = 100,
+    ):
+        """
+        :param poll_interval: Максимальная пауза между проверками правил (секунды)
+        :param ahead: За сколько секунд до срабатывания создавать пост,
+            чтобы диспетчер успел подготовить публикацию
+        :param batch_size: Сколько правил обрабатывать за одну транзакцию
+        """
+        self.poll_interval = poll_interval
+        self.ahead = ahead
+        self.batch_size = batch_size
+        self._db_manager: DatabaseManager | None = None
+        self._on_materialized: MaterializedCallback | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, db_manager: DatabaseManager, on_materialized: MaterializedCallback):
+        if self._task:
+            return
+        self._db_manager = db_manager
+        self._on_materialized = on_materialized
+        self._task = asyncio.create_task(self._run(), name="recurring-expander")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                # Полная пачка - возможно, созрели ещё правила
+                while len(await self.expand()) == self.batch_size:
+                    pass
+                delay = await self._until_next()
+            except Exception as e:
+                logger.error(f"Failed to expand recurring rules: {e}")
+                delay = self.poll_interval
+            await asyncio.sleep(delay)
+
+    async def _until_next(self) -> float:
+        async with self._db_manager.session_factory() as session:
+            result = await session.execute(
+                select(func.min(RecurringRule.next_run)).where(
+                    RecurringRule.is_active == True
+                )
+            )
+            next_run = result.scalar()
+        if next_run is None:
+            return self.poll_interval
+        delay = (next_run - datetime.now()).total_seconds() - self.ahead
+        return min(self.poll_interval, max(delay, 0.0))
+
+    async def expand(self) -> list[tuple[int, datetime]]:
+        """Создаёт посты для созревших правил, возвращает (post_id, publish_time)"""
+        now = datetime.now()
+        async with self._db_manager.session_factory() as session:
+            result = await session.execute(
+                select(RecurringRule)
+                .where(
+                    RecurringRule.is_active == True,
+                    RecurringRule.next_run <= now + timedelta(seconds=self.ahead),
+                )
+                .order_by(RecurringRule.next_run)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rules = result.scalars().all()
+            values = []
+            for rule in rules:
+                values.append(
+                    dict(
+                        channel_id=rule.channel_id,
+                        title=rule.title,
+                        text=rule.text,
+                        photos=rule.photos,
+                        videos=rule.videos,
+                        document=rule.document,
+                        publish_time=rule.next_run,
+                        status=PostStatus.PENDING,
+                        created_by=rule.created_by,
+                        rule_id=rule.id,
+                    )
+                )
+                rule.next_run = next_occurrence(rule, max(rule.next_run, now))
+                if rule.next_run is None:
+                    rule.is_active = False
+                    logger.info(f"Recurring rule ID:{rule.id} is exhausted")
+            created = []
+            if values:
+                # Уже созданное повторение (например, пост добавлен вручную)
+                # пропускается, иначе одна коллизия откатила бы всю пачку и
+                # правила навсегда застряли бы на своём next_run
+                result = await session.execute(
+                    insert(Post)
+                    .values(values)
+                    .on_conflict_do_nothing(index_elements=[Post.rule_id, Post.publish_time])
+                    .returning(Post.id, Post.publish_time)
+                )
+                created = [tuple(row) for row in result.all()]
+                if len(created) < len(values):
+                    logger.warning(
+                        f"Skipped {len(values) - len(created)} already materialized recurrences"
+                    )
+            await session.commit()
+        for post_id, publish_time in created:
+            self._on_materialized(post_id, publish_time)
+        if created:
+            logger.info(f"Materialized {len(created)} posts from recurring rules")
+        return created
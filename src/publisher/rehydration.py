@@ -0,0 +1,71 @@
+import enum
+import time
+from datetime import datetime, timedelta
+
+from loguru import logger
+
+from src.core.crud import (
+    cancel_overdue_posts,
+    pace_overdue_posts,
+    stream_pending_schedule,
+)
+from src.core.database import DatabaseManager
+
+
+class CatchUpPolicy(enum.Enum):
+    ALL = "all"  # опубликовать все просроченные, но не больше burst в секунду
+    SKIP = "skip"  # отменить просроченные посты
+    SPREAD = "spread"  # равномерно распределить просроченные по окну
+
+
+async def apply_catchup_policy(
+    db_manager: DatabaseManager,
+    policy: CatchUpPolicy,
+    grace: float = 60.0,
+    burst: int = 20,
+    window: float = 1800.0,
+) -> int:
+    """Применяет политику догоняния к постам, просроченным больше чем на grace секунд"""
+    now = datetime.now()
+    cutoff = now - timedelta(seconds=grace)
+    async with db_manager.unit_of_work() as session:
+        if policy == CatchUpPolicy.SKIP:
+            affected = await cancel_overdue_posts(session, cutoff)
+        elif policy == CatchUpPolicy.SPREAD:
+            affected = await pace_overdue_posts(session, cutoff, now, window=window)
+        else:
+            affected = await pace_overdue_posts(session, cutoff, now, burst=burst)
+    if affected:
+        logger.warning(
+            f"Catch-up policy '{policy.value}' applied to {affected} overdue posts"
+        )
+    return affected
+
+
+async def rehydrate(
+    db_manager: DatabaseManager,
+    dispatcher,
+    policy: CatchUpPolicy = CatchUpPolicy.ALL,
+    grace: float = 60.0,
+    burst: int = 20,
+    window: float = 1800.0,
+    chunk_size: int = 5000,
+) -> int:
+    """Восстанавливает расписание при старте бота.
+
+    Сначала одним запросом применяет политику к просроченным постам, затем
+    потоково читает ожидающие посты в порядке publish_time и регистрирует их
+    в диспетчере одной пачкой.
+    """
+    start = time.monotonic()
+    await apply_catchup_policy(db_manager, policy, grace, burst, window)
+    entries: list[tuple[datetime, int]] = []
+    async with db_manager.session_factory() as session:
+        async for chunk in stream_pending_schedule(session, chunk_size):
+            entries.extend(chunk)
+    dispatcher.schedule_many(entries)
+    logger.info(
+        f"Rehydrated {len(entries)} pending posts in "
+        f"{round((time.monotonic() - start) * 1000, 2)} ms"
+    )
+    return len(entries)
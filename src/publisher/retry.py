@@ -0,0 +1,100 @@
+import random
+from dataclasses import dataclass
+
+from aiogram.exceptions import (
+    RestartingTelegram,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+
+class PublishError(Exception):
+    """Публикация не удалась; errors - исходные ошибки по каждому чату"""
+
+    def __init__(self, message: str, errors: list[Exception] | None = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+class PartialSendError(Exception):
+    """Отправка альбома оборвалась на середине; message_ids - уже ушедшие сообщения"""
+
+    def __init__(self, message_ids: list[int], error: Exception):
+        super().__init__(str(error))
+        self.message_ids = message_ids
+        self.error = error
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    base_delay: float
+    max_delay: float
+    max_attempts: int
+
+    def delay(self, attempt: int) -> float:
+        # Экспоненциальная задержка с джиттером, чтобы упавшая волна не вернулась разом
+        delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return delay * random.uniform(0.9, 1.1)
+
+
+# Политики по классам ошибок: флуд-контроль ждём долго, битые запросы почти не повторяем
+DEFAULT_POLICIES: dict[str, RetryPolicy] = {
+    "flood_wait": RetryPolicy(base_delay=5, max_delay=3600, max_attempts=10),
+    "chat_not_found": RetryPolicy(base_delay=300, max_delay=3600, max_attempts=3),
+    "forbidden": RetryPolicy(base_delay=600, max_delay=3600, max_attempts=2),
+    "bad_request": RetryPolicy(base_delay=60, max_delay=600, max_attempts=2),
+    "server_error": RetryPolicy(base_delay=10, max_delay=600, max_attempts=8),
+    "unknown": RetryPolicy(base_delay=30, max_delay=1800, max_attempts=5),
+}
+
+
+def classify_error(error: Exception) -> str:
+    if isinstance(error, PartialSendError):
+        return classify_error(error.error)
+    if isinstance(error, PublishError) and error.errors:
+        classes = [classify_error(cause) for cause in error.errors]
+        # Флуд-контроль важнее прочего: остальные чаты просто ещё не дошли до лимита
+        return "flood_wait" if "flood_wait" in classes else classes[0]
+    if isinstance(error, TelegramRetryAfter):
+        return "flood_wait"
+    if isinstance(error, TelegramNotFound) or (
+        isinstance(error, TelegramBadRequest) and "chat not found" in error.message.lower()
+    ):
+        return "chat_not_found"
+    if isinstance(error, TelegramForbiddenError):
+        return "forbidden"
+    if isinstance(error, TelegramBadRequest):
+        return "bad_request"
+    if isinstance(error, (TelegramServerError, RestartingTelegram, TelegramNetworkError)):
+        return "server_error"
+    return "unknown"
+
+
+def _retry_after(error: Exception) -> float:
+    if isinstance(error, TelegramRetryAfter):
+        return float(error.retry_after)
+    if isinstance(error, PartialSendError):
+        return _retry_after(error.error)
+    if isinstance(error, PublishError):
+        return max((_retry_after(cause) for cause in error.errors), default=0.0)
+    return 0.0
+
+
+class RetryQueue:
+    """Решает, когда повторить упавшую публикацию и когда сдаться"""
+
+    def __init__(self, policies: dict[str, RetryPolicy] | None = None):
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+
+    def next_delay(self, error: Exception, attempt: int) -> tuple[str, float | None]:
+        """Класс ошибки и задержка до попытки attempt+1, None - в dead letters"""
+        error_class = classify_error(error)
+        policy = self.policies[error_class]
+        if attempt >= policy.max_attempts:
+            return error_class, None
+        # retry_after от Telegram - нижняя граница задержки
+        return error_class, max(policy.delay(attempt), _retry_after(error))
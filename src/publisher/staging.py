@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from aiogram.types import InputMediaPhoto, InputMediaVideo
+from loguru import logger
+
+from src.core.crud import get_posts_for_publish
+from src.core.database import DatabaseManager
+from src.core.models import PostStatus
+from src.publisher.retry import PartialSendError
+
+# Больше файлов Bot API в одну медиагруппу не принимает
+MEDIA_GROUP_LIMIT = 10
+
+
+@dataclass(frozen=True)
+class PublishPayload:
+    """Подготовленная публикация: всё, что нужно в момент отправки, без базы"""
+
+    post_id: int
+    # updated_at поста на момент подготовки, по нему проверяется актуальность
+    version: datetime
+    publish_time: datetime
+    title: str
+    text: str
+    document: str | None
+    # Альбом, разбитый на медиагруппы по MEDIA_GROUP_LIMIT файлов
+    media: tuple[tuple[InputMediaPhoto | InputMediaVideo, ...], ...]
+    channel_id: int
+    channel_name: str
+    notification_chat_id: int | None
+    # Каналы кросспостинга, куда пост ещё не опубликован
+    targets: tuple[int, ...]
+    cross_posted: bool
+
+    @classmethod
+    def from_row(cls, row) -> "PublishPayload":
+        """Строит публикацию из строки get_posts_for_publish"""
+        media = [InputMediaPhoto(media=photo) for photo in row.photos or []]
+        media += [InputMediaVideo(media=video) for video in row.videos or []]
+        if media and not row.document:
+            media[0].caption = row.text
+        return cls(
+            post_id=row.id,
+            version=row.updated_at,
+            publish_time=row.publish_time,
+            title=row.title,
+            text=row.text,
+            document=row.document,
+            media=tuple(
+                tuple(media[start : start + MEDIA_GROUP_LIMIT])
+                for start in range(0, len(media), MEDIA_GROUP_LIMIT)
+            ),
+            channel_id=row.channel_id,
+            channel_name=row.channel_name,
+            notification_chat_id=row.notification_chat_id,
+            targets=tuple(row.targets or ()),
+            cross_posted=row.cross_posted,
+        )
+
+    async def send(self, bot, chat_id: int, sent: list[int] | None = None) -> list[int]:
+        """Отправляет пост в чат и возвращает ID всех его сообщений.
+
+        Медиагруппы альбома уходят строго по очереди, иначе Telegram может
+        показать их в чате вперемешку. sent - сообщения прошлой попытки:
+        уже отправленные группы пропускаются, и повтор продолжает альбом.
+        """
+        if self.document:
+            msg = await bot.send_document(
+                chat_id=chat_id, document=self.document, caption=self.text
+            )
+            return [msg.message_id]
+        if not self.media:
+            msg = await bot.send_message(chat_id=chat_id, text=self.text)
+            return [msg.message_id]
+        message_ids = list(sent or [])
+        skip = len(message_ids)
+        for chunk in self.media:
+            if skip >= len(chunk):
+                skip -= len(chunk)
+                continue
+            try:
+                messages = await bot.send_media_group(chat_id=chat_id, media=list(chunk))
+            except Exception as e:
+                if message_ids:
+                    raise PartialSendError(message_ids, e) from e
+                raise
+            message_ids += [message.message_id for message in messages]
+        return message_ids
+
+
+class PayloadStager:
+    """Кэш публикаций, подготовленных за lead секунд до publish_time.
+
+    Диспетчер вызывает stage() заранее, поэтому в момент публикации не нужно
+    читать пост, канал и цели и собирать медиагруппу. Подготовленные данные
+    сверяются с updated_at поста при захвате: изменённый пост читается заново.
+    """
+
+    def __init__(self, lead: float = 30.0, max_size: int = 10_000, ttl: float = 600.0):
+        """
+        :param lead: За сколько секунд до publish_time готовить публикацию
+        :param max_size: Сколько подготовленных публикаций держать в памяти
+        :param ttl: Через сколько секунд после publish_time забывать невостребованные
+        """
+        self.lead = lead
+        self.max_size = max_size
+        self.ttl = ttl
+        self._payloads: dict[int, PublishPayload] = {}
+        # Версии захваченных постов: подготовка, закончившаяся уже после
+        # захвата, не должна подложить устаревшие данные
+        self._claimed: dict[int, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    async def stage(self, db_manager: DatabaseManager, post_ids: list[int], chunk_size: int = 500):
+        self._evict()
+        for start in range(0, len(post_ids), chunk_size):
+            async with db_manager.session_factory() as session:
+                rows = await get_posts_for_publish(
+                    session, post_ids[start : start + chunk_size]
+                )
+            for post in rows:
+                if post.id in self._claimed:
+                    # Захвачен, но ещё не опубликован: годится только та же версия
+                    if self._claimed[post.id] != post.updated_at:
+                        continue
+                elif post.status != PostStatus.PENDING:
+                    continue
+                if len(self._payloads) >= self.max_size:
+                    logger.warning(
+                        f"Payload stage is full ({self.max_size}), "
+                        f"remaining posts will be loaded at publish time"
+                    )
+                    return
+                self._payloads[post.id] = PublishPayload.from_row(post)
+
+    def _evict(self):
+        expired = datetime.now() - timedelta(seconds=self.ttl)
+        for post_id in [
+            post_id
+            for post_id, payload in self._payloads.items()
+            if payload.publish_time < expired
+        ]:
+            del self._payloads[post_id]
+
+    def validate(self, post_id: int, version: datetime):
+        """Выбрасывает подготовленную публикацию, если пост с тех пор изменился"""
+        self._claimed[post_id] = version
+        payload = self._payloads.get(post_id)
+        if payload is not None and payload.version != version:
+            del self._payloads[post_id]
+
+    def pop(self, post_id: int) -> PublishPayload | None:
+        self._claimed.pop(post_id, None)
+        return self._payloads.pop(post_id, None)
+
+    def discard(self, post_id: int):
+        self._payloads.pop(post_id, None)
+
+    def clear(self):
+        self._payloads.clear()
+        self._claimed.clear()
@@ -0,0 +1,119 @@
+import math
+from datetime import datetime
+from typing import Hashable
+
+
+class TimingWheel:
+    """Иерархическое колесо таймеров для отслеживания времени публикации.
+
+    Вставка и отмена - O(1), все ключи одного тика отдаются одной пачкой.
+    Уровень i хранит ключи, до срабатывания которых меньше slots**(i+1) тиков;
+    при обороте младшего уровня ключи очередного слота старшего уровня
+    опускаются ниже. Ключи дальше горизонта колеса лежат в отдельном списке.
+    """
+
+    def __init__(
+        self,
+        tick: float = 1.0,
+        slots: int = 64,
+        levels: int = 4,
+        start: datetime | None = None,
+    ):
+        """
+        :param tick: Длительность тика (секунды)
+        :param slots: Количество слотов на каждом уровне
+        :param levels: Количество уровней (горизонт - slots**levels тиков)
+        :param start: Момент, от которого отсчитываются тики
+        """
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._epoch = start or datetime.now()
+        self._current = 0
+        self._wheels: list[list[dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: dict[Hashable, int] = {}
+        self._ready: dict[Hashable, int] = {}
+        self._index: dict[Hashable, dict[Hashable, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def _to_tick(self, moment: datetime) -> int:
+        # Округляем вверх: тик не должен сработать раньше publish_time
+        return math.ceil((moment - self._epoch).total_seconds() / self.tick)
+
+    def _bucket(self, due_tick: int) -> dict[Hashable, int]:
+        delta = due_tick - self._current
+        if delta <= 0:
+            return self._ready
+        unit = 1
+        for level in range(self.levels):
+            if delta < unit * self.slots:
+                return self._wheels[level][(due_tick // unit) % self.slots]
+            unit *= self.slots
+        return self._overflow
+
+    def _place(self, key: Hashable, due_tick: int):
+        bucket = self._bucket(due_tick)
+        bucket[key] = due_tick
+        self._index[key] = bucket
+
+    def insert(self, key: Hashable, due: datetime):
+        """Добавляет или переносит ключ на новое время"""
+        self.cancel(key)
+        self._place(key, self._to_tick(due))
+
+    def cancel(self, key: Hashable) -> bool:
+        bucket = self._index.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def _cascade(self, level: int):
+        if level >= self.levels:
+            entries, self._overflow = self._overflow, {}
+        else:
+            span = self.slots**level
+            slot = (self._current // span) % self.slots
+            entries = self._wheels[level][slot]
+            self._wheels[level][slot] = {}
+        for key, due_tick in entries.items():
+            self._place(key, due_tick)
+
+    def advance(self, now: datetime | None = None) -> list[Hashable]:
+        """Продвигает колесо до now и возвращает все созревшие ключи"""
+        target = math.floor(
+            ((now or datetime.now()) - self._epoch).total_seconds() / self.tick
+        )
+        due: list[Hashable] = []
+        while self._current < target:
+            if not self._index:
+                # Пустое колесо перематываем сразу
+                self._current = target
+                break
+            self._current += 1
+            # Сначала опускаем старшие уровни, на границе которых стоим
+            level, span = 1, self.slots
+            while level <= self.levels and self._current % span == 0:
+                level += 1
+                span *= self.slots
+            for upper in range(level - 1, 0, -1):
+                self._cascade(upper)
+            slot = self._current % self.slots
+            entries = self._wheels[0][slot]
+            self._wheels[0][slot] = {}
+            for key in entries:
+                del self._index[key]
+            due.extend(entries)
+        if self._ready:
+            for key in self._ready:
+                del self._index[key]
+            due.extend(self._ready)
+            self._ready = {}
+        return due
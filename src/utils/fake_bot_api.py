@@ -0,0 +1,213 @@
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from aiohttp import web
+from loguru import logger
+
+
+@dataclass
+class FakeBotAPIConfig:
+    """Поведение фейкового Bot API; по умолчанию отвечает мгновенно и без ошибок"""
+
+    # Задержка ответа: latency плюс равномерный джиттер от 0 до jitter секунд
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Доля запросов, на которые отвечаем 429 с retry_after секундами
+    flood_rate: float = 0.0
+    retry_after: int = 5
+    # Доля запросов, с которых начинается серия из error_burst ответов 5xx
+    error_rate: float = 0.0
+    error_burst: int = 3
+    error_status: int = 502
+    # Лимиты Bot API: сообщений в секунду в один чат и всего, 0 - без лимита
+    chat_limit: float = 1.0
+    global_limit: float = 30.0
+    seed: int | None = None
+
+
+# Методы, которые отправляют сообщения и расходуют лимиты
+SENDING_METHODS = frozenset({"sendMessage", "sendMediaGroup", "sendDocument", "editMessageText"})
+
+
+class SlidingWindow:
+    """Не больше limit событий за window секунд"""
+
+    def __init__(self, limit: float, window: float = 1.0):
+        self.limit = limit
+        self.window = window
+        self._events: deque[float] = deque()
+
+    def hit(self, now: float) -> float:
+        """Учитывает событие; возвращает 0 или сколько секунд ждать до следующего"""
+        while self._events and self._events[0] <= now - self.window:
+            self._events.popleft()
+        if len(self._events) >= self.limit:
+            return self._events[0] + self.window - now
+        self._events.append(now)
+        return 0.0
+
+
+class FakeBotAPI:
+    """Локальный Bot API на aiohttp для нагрузочных тестов и внесения отказов.
+
+    Понимает методы, которыми пользуется бот: sendMessage, sendMediaGroup,
+    sendDocument, editMessageText, deleteMessage, getUpdates, а также getMe и
+    deleteWebhook, без которых бот не стартует. Ответы имеют формат настоящего
+    API, поэтому aiogram разбирает их теми же моделями и исключениями.
+    Бот направляется сюда настройкой run.api_server.
+    """
+
+    def __init__(self, config: FakeBotAPIConfig | None = None, host: str = "127.0.0.1", port: int = 8081):
+        self.config = config or FakeBotAPIConfig()
+        self.host = host
+        self.port = port
+        self.stats: Counter[str] = Counter()
+        self._random = random.Random(self.config.seed)
+        self._burst_left = 0
+        self._message_id = 0
+        self._chats: dict[str, SlidingWindow] = {}
+        self._global = SlidingWindow(self.config.global_limit)
+        self._updates: list[dict] = []
+        self._update_id = 0
+        self._new_update = asyncio.Event()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def feed_update(self, update: dict):
+        """Кладёт апдейт в очередь getUpdates; update_id проставляется здесь"""
+        self._update_id += 1
+        self._updates.append({**update, "update_id": self._update_id})
+        self._new_update.set()
+
+    def reset_stats(self):
+        self.stats.clear()
+
+    @staticmethod
+    def _ok(result) -> web.Response:
+        return web.json_response({"ok": True, "result": result})
+
+    @staticmethod
+    def _error(status: int, description: str, parameters: dict | None = None) -> web.Response:
+        body = {"ok": False, "error_code": status, "description": description}
+        if parameters:
+            body["parameters"] = parameters
+        return web.json_response(body, status=status)
+
+    def _too_many_requests(self, retry_after: float) -> web.Response:
+        retry_after = max(1, math.ceil(retry_after))
+        self.stats["429"] += 1
+        return self._error(
+            429,
+            f"Too Many Requests: retry after {retry_after}",
+            {"retry_after": retry_after},
+        )
+
+    def _message(self, chat_id: str, **fields) -> dict:
+        self._message_id += 1
+        chat = int(chat_id) if chat_id.lstrip("-").isdigit() else 0
+        return {
+            "message_id": self._message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat, "type": "channel" if chat < 0 else "private"},
+            **fields,
+        }
+
+    def _inject_fault(self, method: str, chat_id: str | None) -> web.Response | None:
+        config = self.config
+        if self._burst_left:
+            self._burst_left -= 1
+            self.stats["5xx"] += 1
+            return self._error(config.error_status, HTTPStatus(config.error_status).phrase)
+        if config.error_rate and self._random.random() < config.error_rate:
+            self._burst_left = config.error_burst - 1
+            self.stats["5xx"] += 1
+            return self._error(config.error_status, HTTPStatus(config.error_status).phrase)
+        if method not in SENDING_METHODS:
+            return None
+        if config.flood_rate and self._random.random() < config.flood_rate:
+            return self._too_many_requests(config.retry_after)
+        now = time.monotonic()
+        if chat_id is not None and config.chat_limit:
+            window = self._chats.setdefault(chat_id, SlidingWindow(config.chat_limit))
+            if wait := window.hit(now):
+                return self._too_many_requests(wait)
+        if config.global_limit and (wait := self._global.hit(now)):
+            return self._too_many_requests(wait)
+        return None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = dict(await request.post())
+        if not params and request.can_read_body:
+            params = await request.json()
+        params = {key: str(value) for key, value in params.items()}
+        chat_id = params.get("chat_id")
+        self.stats[f"requests.{method}"] += 1
+        if method == "getUpdates":
+            return await self._get_updates(params)
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if fault := self._inject_fault(method, chat_id):
+            return fault
+        if method == "sendMessage":
+            result = self._message(chat_id, text=params.get("text", ""))
+        elif method == "sendDocument":
+            result = self._message(
+                chat_id,
+                caption=params.get("caption", ""),
+                document={"file_id": params.get("document", ""), "file_unique_id": "fake"},
+            )
+        elif method == "sendMediaGroup":
+            media = json.loads(params.get("media", "[]"))
+            result = [
+                self._message(chat_id, caption=item.get("caption") or "", media_group_id="fake")
+                for item in media
+            ]
+        elif method == "editMessageText":
+            result = self._message(chat_id, text=params.get("text", ""))
+            result["message_id"] = int(params.get("message_id", 0))
+        elif method in ("deleteMessage", "deleteWebhook", "setWebhook"):
+            result = True
+        elif method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+        else:
+            return self._error(404, "Not Found: method not found")
+        self.stats["ok"] += 1
+        return self._ok(result)
+
+    async def _get_updates(self, params: dict) -> web.Response:
+        offset = int(params.get("offset", 0))
+        self._updates = [update for update in self._updates if update["update_id"] >= offset]
+        if not self._updates:
+            self._new_update.clear()
+            try:
+                await asyncio.wait_for(
+                    self._new_update.wait(), timeout=float(params.get("timeout", 0))
+                )
+            except asyncio.TimeoutError:
+                pass
+        limit = int(params.get("limit", 100))
+        return self._ok(self._updates[:limit])
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Fake Bot API is served on {self.url}")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,217 @@
+import bisect
+import math
+from typing import Callable, Iterable
+
+from aiohttp import web
+from loguru import logger
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Монотонно растущий счётчик"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """Текущее значение; с collect значение вычисляется в момент чтения метрик.
+
+    У гауджа с метками collect возвращает словарь {значения меток: значение}.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        collect: Callable[[], float | dict[LabelValues, float] | None] | None = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+        self.collect = collect
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> Iterable[str]:
+        values = self._values
+        if self.collect is not None:
+            value = self.collect()
+            if value is None:
+                return
+            if not isinstance(value, dict):
+                yield f"{self.name} {_format_value(value)}"
+                return
+            values = value
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """Гистограмма с кумулятивными бакетами, p99 считается на стороне Prometheus"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float],
+        labels: Iterable[str] = (),
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        counts = self._counts.setdefault(key, [0] * len(self.buckets))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self) -> Iterable[str]:
+        for key, counts in self._counts.items():
+            total = 0
+            for bound, count in zip(self.buckets, counts):
+                total += count
+                labels = _format_labels(
+                    self.label_names, key, f'le="{_format_value(bound)}"'
+                )
+                yield f"{self.name}_bucket{labels} {total}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {total}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        collect: Callable[[], float | dict[LabelValues, float] | None] | None = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labels, collect))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float],
+        labels: Iterable[str] = (),
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets, labels))
+
+    def render(self) -> str:
+        """Текстовый формат экспозиции Prometheus"""
+        parts = []
+        for metric in self._metrics.values():
+            try:
+                parts.append(metric.render())
+            except Exception as e:
+                logger.error(f"Failed to collect metric {metric.name}: {e}")
+        return "\n".join(parts) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class MetricsServer:
+    """HTTP-эндпоинт /metrics для Prometheus на aiohttp, уже идущем с aiogram"""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 9100, metrics: MetricsRegistry = registry):
+        self.host = host
+        self.port = port
+        self.metrics = metrics
+        self._runner: web.AppRunner | None = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.metrics.render(), content_type="text/plain", charset="utf-8"
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Metrics are served on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
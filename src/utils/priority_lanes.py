@@ -0,0 +1,147 @@
+import asyncio
+import enum
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+class Lane(enum.IntEnum):
+    """Полосы исходящих запросов, меньшее значение - выше приоритет"""
+
+    INTERACTIVE = 0  # админ-панель: ответы и edit_text в хендлерах
+    PUBLISH = 1  # плановые публикации постов
+    BACKGROUND = 2  # уведомления и фоновые задачи
+
+
+# Полоса текущей задачи. По умолчанию всё, что пришло из хендлеров, интерактивное
+api_lane: ContextVar[Lane] = ContextVar("api_lane", default=Lane.INTERACTIVE)
+
+
+@contextmanager
+def use_lane(lane: Lane):
+    """Выполняет запросы к Bot API внутри блока в указанной полосе"""
+    token = api_lane.set(lane)
+    try:
+        yield
+    finally:
+        api_lane.reset(token)
+
+
+@dataclass
+class LaneStats:
+    limit: int
+    in_flight: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    completed: int = 0
+    total_wait: float = 0.0
+
+    @property
+    def avg_wait_ms(self) -> float:
+        if not self.completed:
+            return 0.0
+        return round(self.total_wait / self.completed * 1000, 2)
+
+
+class PriorityLanes:
+    """Планировщик исходящих запросов с приоритетными полосами.
+
+    У каждой полосы свой лимит параллельных запросов, а общий лимит делится
+    между полосами строго по приоритету: освободившийся слот получает самая
+    приоритетная ожидающая полоса.
+    """
+
+    def __init__(
+        self,
+        limits: dict[Lane, int] | None = None,
+        total: int = 16,
+    ):
+        """
+        :param limits: Лимит параллельных запросов для каждой полосы
+        :param total: Общий лимит параллельных запросов
+        """
+        limits = limits or {
+            Lane.INTERACTIVE: 8,
+            Lane.PUBLISH: 10,
+            Lane.BACKGROUND: 3,
+        }
+        self.total = total
+        self.stats = {lane: LaneStats(limit=limits[lane]) for lane in Lane}
+        self._waiters: dict[Lane, deque[asyncio.Future]] = {
+            lane: deque() for lane in Lane
+        }
+        self._in_flight = 0
+
+    def _can_run(self, lane: Lane) -> bool:
+        stats = self.stats[lane]
+        return self._in_flight < self.total and stats.in_flight < stats.limit
+
+    def _grant(self, lane: Lane):
+        self._in_flight += 1
+        self.stats[lane].in_flight += 1
+
+    def _dispatch(self):
+        for lane in Lane:
+            waiters = self._waiters[lane]
+            while waiters and self._can_run(lane):
+                future = waiters.popleft()
+                self.stats[lane].waiting -= 1
+                self._grant(lane)
+                future.set_result(None)
+
+    async def acquire(self, lane: Lane):
+        # Ожидающие более приоритетных полос упираются только в свой лимит,
+        # иначе _dispatch уже выдал бы им слот, поэтому проверяем лишь свою очередь
+        if self._can_run(lane) and not self._waiters[lane]:
+            self._grant(lane)
+            return
+        stats = self.stats[lane]
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(future)
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Слот уже выдан, но задача отменена - возвращаем его
+                self.release(lane)
+            else:
+                self._waiters[lane].remove(future)
+                stats.waiting -= 1
+                self._dispatch()
+            raise
+
+    def release(self, lane: Lane):
+        self._in_flight -= 1
+        self.stats[lane].in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane: Lane | None = None):
+        lane = api_lane.get() if lane is None else lane
+        start = time.monotonic()
+        await self.acquire(lane)
+        stats = self.stats[lane]
+        stats.total_wait += time.monotonic() - start
+        try:
+            yield
+        finally:
+            stats.completed += 1
+            self.release(lane)
+
+    def snapshot(self) -> dict[str, dict]:
+        """Метрики полос: глубина очереди, запросы в работе, среднее ожидание"""
+        return {
+            lane.name.lower(): {
+                "limit": stats.limit,
+                "in_flight": stats.in_flight,
+                "queue_depth": stats.waiting,
+                "max_queue_depth": stats.max_waiting,
+                "completed": stats.completed,
+                "avg_wait_ms": stats.avg_wait_ms,
+            }
+            for lane, stats in self.stats.items()
+        }
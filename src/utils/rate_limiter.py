@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any
+
+from aiogram.methods.base import TelegramMethod
+
+# Методы, которые не отправляют сообщений и не должны расходовать лимиты
+UNLIMITED_METHODS = frozenset({"getUpdates", "getMe", "deleteWebhook", "setWebhook"})
+
+
+class TokenBucket:
+    """Асинхронный token bucket: rate токенов в секунду, не больше capacity"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def idle(self) -> bool:
+        """Бакет полон и никем не занят - его можно безопасно выбросить"""
+        self._refill(time.monotonic())
+        return not self._lock.locked() and self._tokens >= self.capacity
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self):
+        # asyncio.Lock отдаёт очередь в порядке FIFO, так что ожидающие не голодают
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def block(self, seconds: float):
+        """Полностью останавливает бакет, например после TelegramRetryAfter"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+class TelegramRateLimiter:
+    """Проактивный лимитер запросов к Bot API: общий бакет плюс бакет на каждый чат"""
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        group_rate: float = 20 / 60,
+        private_rate: float = 1.0,
+        max_chats: int = 10_000,
+    ):
+        """
+        :param global_rate: Общий лимит запросов в секунду
+        :param group_rate: Лимит запросов в секунду для групп и каналов
+        :param private_rate: Лимит запросов в секунду для личных чатов
+        :param max_chats: Сколько бакетов чатов держать в памяти
+        """
+        self.group_rate = group_rate
+        self.private_rate = private_rate
+        self.max_chats = max_chats
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self._chats: OrderedDict[Any, TokenBucket] = OrderedDict()
+
+    @staticmethod
+    def chat_key(method: TelegramMethod) -> Any:
+        return getattr(method, "chat_id", None)
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is not None:
+            self._chats.move_to_end(chat_id)
+            return bucket
+        # Отрицательные ID и @username - группы и каналы
+        is_group = isinstance(chat_id, str) or chat_id < 0
+        rate = self.group_rate if is_group else self.private_rate
+        # Небольшой запас на всплеск: группе - 3 сообщения, личке - 1 в секунду
+        bucket = TokenBucket(rate, 3 if is_group else max(1.0, rate))
+        self._chats[chat_id] = bucket
+        self._evict()
+        return bucket
+
+    def _evict(self):
+        if len(self._chats) <= self.max_chats:
+            return
+        for chat_id in list(self._chats):
+            if len(self._chats) <= self.max_chats:
+                break
+            if self._chats[chat_id].idle:
+                del self._chats[chat_id]
+
+    async def acquire_chat(self, method: TelegramMethod):
+        if method.__api_method__ in UNLIMITED_METHODS:
+            return
+        chat_id = self.chat_key(method)
+        if chat_id is not None:
+            await self._chat_bucket(chat_id).acquire()
+
+    async def acquire_global(self, method: TelegramMethod):
+        if method.__api_method__ in UNLIMITED_METHODS:
+            return
+        await self.global_bucket.acquire()
+
+    async def acquire(self, method: TelegramMethod):
+        # Сначала ждём лимит чата, чтобы не держать общий токен впустую
+        await self.acquire_chat(method)
+        await self.acquire_global(method)
+
+    def penalize(self, method: TelegramMethod, retry_after: float):
+        """Учитывает retry_after от Telegram, чтобы следующие запросы не получали 429"""
+        chat_id = self.chat_key(method)
+        if chat_id is not None:
+            self._chat_bucket(chat_id).block(retry_after)
+        else:
+            self.global_bucket.block(retry_after)
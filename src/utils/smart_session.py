@@ -13,6 +13,9 @@ from aiogram.exceptions import (
 from aiogram.methods.base import TelegramMethod, TelegramType
 from loguru import logger
 
+from src.utils.priority_lanes import Lane, PriorityLanes, api_lane
+from src.utils.rate_limiter import TelegramRateLimiter, UNLIMITED_METHODS
+
 TelegramTypeT = TypeVar("TelegramTypeT", bound=TelegramType)
 
 
@@ -24,17 +27,23 @@ class SmartAiohttpSession(AiohttpSession):
         max_attempts: int = 6,
         base_delay: float = 2.0,
         max_delay: float = 60.0,
+        rate_limiter: Optional[TelegramRateLimiter] = None,
+        lanes: Optional[PriorityLanes] = None,
         **kwargs: Any,
     ):
         """
         :param max_attempts: Максимальное количество попыток выполнения запроса
         :param base_delay: Базовое время ожидания между попытками (секунды)
         :param max_delay: Максимальное время ожидания между попытками (секунды)
+        :param rate_limiter: Проактивный лимитер запросов (по умолчанию лимиты Bot API)
+        :param lanes: Приоритетные полосы исходящих запросов
         """
         super().__init__(**kwargs)
         self.max_attempts = max_attempts
         self.base_delay = base_delay
         self.max_delay = max_delay
+        self.rate_limiter = rate_limiter or TelegramRateLimiter()
+        self.lanes = lanes or PriorityLanes()
 
     @staticmethod
     def _serialize_response(response: Any) -> Dict[str, Any]:
@@ -52,6 +61,22 @@ class SmartAiohttpSession(AiohttpSession):
         start_time = time.monotonic()
         yield lambda: time.monotonic() - start_time
 
+    async def _scheduled_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramTypeT],
+        timeout: Optional[int] = None,
+    ) -> TelegramTypeT:
+        """Запрос через лимитер и приоритетные полосы"""
+        if method.__api_method__ in UNLIMITED_METHODS:
+            # Long polling не должен занимать слот полосы
+            return await super().make_request(bot, method, timeout)
+        # Лимит чата ждём до занятия слота, чтобы медленный чат не держал полосу
+        await self.rate_limiter.acquire_chat(method)
+        async with self.lanes.slot():
+            await self.rate_limiter.acquire_global(method)
+            return await super().make_request(bot, method, timeout)
+
     async def make_request(
         self,
         bot: Bot,
@@ -73,6 +98,10 @@ class SmartAiohttpSession(AiohttpSession):
             timeout=timeout,
         )
 
+        # Публикации повторяет очередь повторов диспетчера: ожидание здесь
+        # заняло бы воркер, а повтор отправки после 5xx может задвоить пост
+        retry_in_session = api_lane.get() != Lane.PUBLISH
+
         with self._measure_time() as get_duration:
             attempt = 0
             last_error: Optional[Exception] = None
@@ -84,7 +113,7 @@ class SmartAiohttpSession(AiohttpSession):
                         "Making API request (attempt {}/{})", attempt, self.max_attempts
                     )
 
-                    result = await super().make_request(bot, method, timeout)
+                    result = await self._scheduled_request(bot, method, timeout)
 
                     context_logger.debug(
                         "API request successful",
@@ -96,6 +125,9 @@ class SmartAiohttpSession(AiohttpSession):
 
                 except TelegramRetryAfter as e:
                     wait_time = min(e.retry_after, self.max_delay)
+                    self.rate_limiter.penalize(method, e.retry_after)
+                    if not retry_in_session:
+                        raise
                     context_logger.warning(
                         "Rate limit exceeded, retrying after {} seconds (attempt {}/{})",
                         wait_time,
@@ -106,6 +138,8 @@ class SmartAiohttpSession(AiohttpSession):
                     last_error = e
 
                 except (RestartingTelegram, TelegramServerError) as e:
+                    if not retry_in_session:
+                        raise
                     wait_time = min(
                         self.base_delay * (2 ** (attempt - 1)), self.max_delay
                     )
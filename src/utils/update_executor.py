@@ -0,0 +1,81 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+from loguru import logger
+
+Job = Callable[[], Awaitable[object]]
+
+
+class _KeyState:
+    def __init__(self, max_pending: int):
+        self.queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_pending)
+        # Задачи ключа, включая ещё ждущие места в очереди
+        self.pending = 0
+        self.worker: asyncio.Task | None = None
+
+
+class OrderedUpdateExecutor:
+    """Параллельная обработка апдейтов разных ключей, строго по порядку внутри ключа.
+
+    Ключ - пара чат/пользователь, как у FSM: медленный обработчик одного
+    админа не держит остальных, а шаги диалога одного админа не меняются
+    местами. Очередь ключа ограничена max_pending, при переполнении submit
+    ждёт - это обратное давление на приём апдейтов.
+    """
+
+    def __init__(self, concurrency: int = 16, max_pending: int = 100):
+        """
+        :param concurrency: Сколько обработчиков выполнять одновременно
+        :param max_pending: Сколько апдейтов одного ключа может ждать обработки
+        """
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._keys: dict[Hashable, _KeyState] = {}
+        self._closed = False
+
+    @property
+    def active_keys(self) -> int:
+        return len(self._keys)
+
+    async def submit(self, key: Hashable, job: Job):
+        if self._closed:
+            raise RuntimeError("Update executor is closed")
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState(self.max_pending)
+        # Счётчик растёт до первого await, поэтому воркер ключа не завершится,
+        # пока эта задача ждёт места в очереди
+        state.pending += 1
+        if state.worker is None:
+            state.worker = asyncio.create_task(self._drain(key, state))
+        try:
+            await state.queue.put(job)
+        except BaseException:
+            state.pending -= 1
+            if not state.pending:
+                state.worker.cancel()
+            raise
+
+    async def _drain(self, key: Hashable, state: _KeyState):
+        try:
+            while state.pending:
+                job = await state.queue.get()
+                try:
+                    async with self._semaphore:
+                        await job()
+                except Exception as e:
+                    logger.exception(f"Update handler failed for key {key}: {e}")
+                finally:
+                    state.pending -= 1
+        finally:
+            if self._keys.get(key) is state:
+                del self._keys[key]
+
+    async def close(self):
+        """Перестаёт принимать апдейты и дожидается уже принятых"""
+        self._closed = True
+        await asyncio.gather(
+            *(state.worker for state in list(self._keys.values()) if state.worker),
+            return_exceptions=True,
+        )
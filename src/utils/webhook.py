@@ -0,0 +1,56 @@
+import hmac
+
+from aiogram import Bot, Dispatcher
+from aiohttp import web
+from loguru import logger
+
+# Заголовок, в котором Telegram присылает secret_token из setWebhook
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookServer:
+    """Приём апдейтов вебхуком: быстрый ответ Telegram и обработка в фоне.
+
+    Обработчик запроса проверяет секрет и отдаёт апдейт диспетчеру, где
+    OrderedUpdateMiddleware ставит его в очередь чата/пользователя и сразу
+    возвращает управление. Ответ Telegram задерживается, только если очередь
+    этого чата переполнена.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: str,
+        path: str = "/webhook",
+    ):
+        """
+        :param secret_token: Секрет setWebhook; запросы без него отклоняются
+        :param path: Путь, на который Telegram присылает апдейты
+        """
+        if not secret_token:
+            raise ValueError("Webhook secret token is required")
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.path = path
+        self.secret_token = secret_token
+
+    def setup(self, app: web.Application):
+        app.router.add_post(self.path, self._handle)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        # Байты, а не строки: compare_digest не принимает не-ASCII строки
+        if not hmac.compare_digest(
+            request.headers.get(SECRET_HEADER, "").encode(), self.secret_token.encode()
+        ):
+            return web.Response(status=401)
+        try:
+            update = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+        try:
+            await self.dispatcher.feed_raw_update(self.bot, update)
+        except Exception as e:
+            # Повторная доставка того же апдейта ошибку не исправит
+            logger.error(f"Failed to accept update {update.get('update_id')}: {e}")
+        return web.Response()